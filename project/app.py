@@ -1,4 +1,5 @@
 import gradio as gr
+import config
 from langchain_core.globals import set_debug
 from ui.css import custom_css
 from ui.gradio_app import create_gradio_ui
@@ -7,5 +8,7 @@ set_debug(True)
 
 if __name__ == "__main__":
     demo = create_gradio_ui()
+    # Chat handlers are async and spend most of their time awaiting Ollama, so many can share the event loop
+    demo.queue(default_concurrency_limit=config.CHAT_CONCURRENCY_LIMIT)
     print("\n🚀 Launching RAG Assistant...")
     demo.launch(css=custom_css)
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""Chunking time and peak memory on large, header-dense markdown.
+
+Run from the project directory:
+
+    python -m benchmarks.chunking --size-mb 50
+
+Generates a synthetic markdown file made of tiny #/##/### sections (the
+shape of converted PDFs with many headings), splits it on headers once and
+runs the merge/split/clean steps that build parent chunks with the previous
+implementation and with the current DocumentChuncker. Reports wall time
+(untraced run) and peak traced memory of those steps, and checks that both
+produce identical parents.
+"""
+import argparse
+import copy
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+import config
+from document_chunker import DocumentChuncker
+
+WORDS = "data model system value process result table figure section method analysis report".split()
+
+def generate_markdown(path, size_mb, seed=0):
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            level = rng.choice((1, 2, 2, 3, 3, 3))
+            body = " ".join(rng.choice(WORDS) for _ in range(rng.choice((1, 2, 3, 5, 8, 40))))
+            section = f"{'#' * level} Heading {rng.randrange(10000)}\n\n{body}\n\n"
+            f.write(section)
+            written += len(section)
+
+def _chain(target, source, prepend=False):
+    for k, v in source.items():
+        if k in target:
+            target[k] = f"{v} -> {target[k]}" if prepend else f"{target[k]} -> {v}"
+        else:
+            target[k] = v
+
+def legacy_parents(chunks):
+    """The merge/split/clean steps as they were before they were made linear."""
+    merged, current = [], None
+    for chunk in chunks:
+        if current is None:
+            current = chunk
+        else:
+            current.page_content += "\n\n" + chunk.page_content
+            _chain(current.metadata, chunk.metadata)
+        if len(current.page_content) >= config.MIN_PARENT_SIZE:
+            merged.append(current)
+            current = None
+    if current:
+        if merged:
+            merged[-1].page_content += "\n\n" + current.page_content
+            _chain(merged[-1].metadata, current.metadata)
+        else:
+            merged.append(current)
+
+    split = []
+    for chunk in merged:
+        if len(chunk.page_content) <= config.MAX_PARENT_SIZE:
+            split.append(chunk)
+        else:
+            splitter = RecursiveCharacterTextSplitter(chunk_size=config.MAX_PARENT_SIZE, chunk_overlap=config.CHILD_CHUNK_OVERLAP)
+            split.extend(splitter.split_documents([chunk]))
+
+    cleaned = []
+    for i, chunk in enumerate(split):
+        if len(chunk.page_content) < config.MIN_PARENT_SIZE:
+            if cleaned:
+                cleaned[-1].page_content += "\n\n" + chunk.page_content
+                _chain(cleaned[-1].metadata, chunk.metadata)
+            elif i < len(split) - 1:
+                split[i + 1].page_content = chunk.page_content + "\n\n" + split[i + 1].page_content
+                _chain(split[i + 1].metadata, chunk.metadata, prepend=True)
+            else:
+                cleaned.append(chunk)
+        else:
+            cleaned.append(chunk)
+    return cleaned
+
+def current_parents(chunks, chunker=DocumentChuncker()):
+    merged = chunker._DocumentChuncker__merge_small_parents(chunks)
+    split = chunker._DocumentChuncker__split_large_parents(merged)
+    return chunker._DocumentChuncker__clean_small_chunks(split)
+
+def measure(build_parents, sections):
+    # Each run gets fresh copies: the legacy steps mutate the header-split chunks
+    chunks = copy.deepcopy(sections)
+    start = time.perf_counter()
+    parents = build_parents(chunks)
+    elapsed = time.perf_counter() - start
+    del chunks, parents
+
+    chunks = copy.deepcopy(sections)
+    tracemalloc.start()
+    parents = build_parents(chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, parents
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        md_path = Path(tmp) / "header_dense.md"
+        generate_markdown(md_path, args.size_mb)
+        size_mb = md_path.stat().st_size / (1024 * 1024)
+        splitter = DocumentChuncker()._DocumentChuncker__parent_splitter
+        start = time.perf_counter()
+        with open(md_path, "r", encoding="utf-8") as f:
+            sections = splitter.split_text(f.read())
+        split_time = time.perf_counter() - start
+
+    print(f"{size_mb:.1f} MB of header-dense markdown, {len(sections)} sections "
+          f"(header split: {split_time:.2f}s, shared by both)\n")
+    print("merge/split/clean:")
+    results = {}
+    for label, build_parents in (("before", legacy_parents), ("after", current_parents)):
+        elapsed, peak, parents = measure(build_parents, sections)
+        results[label] = [(d.page_content, d.metadata) for d in parents]
+        longest = max((len(str(v)) for d in parents for v in d.metadata.values()), default=0)
+        print(f"  {label:7s} {elapsed:8.2f}s  peak {peak / (1024 * 1024):8.1f} MB  "
+              f"{len(parents)} parents, longest metadata value {longest} chars")
+
+    identical = results["before"] == results["after"]
+    print(f"\nOutput identical: {identical}")
+    if not identical:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Offline accuracy and latency of lucky-draw intent detection.
+
+Run from the project directory:
+
+    python -m benchmarks.intent_detection
+    python -m benchmarks.intent_detection --with-llm   # also score the full detector, needs Ollama
+
+The local classifier is scored on held-out messages that are not part of the
+training examples. "Coverage" is the share of messages it decides on its own
+at LUCKY_DRAW_INTENT_CONFIDENCE; the rest would be sent to the LLM.
+"""
+import argparse
+import statistics
+import time
+import config
+from lucky_draw.intent_classifier import IntentClassifier
+from lucky_draw.intent_detector import IntentDetector, SOFT_SIGNALS
+
+HELD_OUT = [
+    ("can I win something with this receipt", True),
+    ("how do I enter your contest", True),
+    ("I want to be part of the giveaway", True),
+    ("add me to the prize contest", True),
+    ("I would like to win please", True),
+    ("what can I win if I enter", True),
+    ("how do I sign up to win a prize", True),
+    ("I want to submit an entry", True),
+    ("I have a purchase receipt, how do I enter", True),
+    ("enter my receipt into the contest", True),
+    ("is it too late to enter", True),
+    ("what prize do winners get and how do I join", True),
+    ("how do I enter recovery mode", False),
+    ("how do I enter a newline in markdown", False),
+    ("what is the win condition in the game described", False),
+    ("draw the sequence diagram for login", False),
+    ("what conclusions can we draw from table 3", False),
+    ("who won the turing prize according to the text", False),
+    ("how does the contest between the models end", False),
+    ("what is the standby power draw", False),
+    ("explain how to enter values in the config file", False),
+    ("why did the proposal win approval", False),
+    ("what are the prize categories in the research grant section", False),
+    ("when do you press enter in the setup wizard", False),
+]
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+def evaluate_local(classifier, confidence):
+    decided, correct, latencies = 0, 0, []
+    for text, label in HELD_OUT:
+        start = time.perf_counter()
+        probability = classifier.probability(text)
+        latencies.append(time.perf_counter() - start)
+        if probability >= confidence or probability <= 1 - confidence:
+            decided += 1
+            correct += (probability >= confidence) == label
+    return decided, correct, latencies
+
+def evaluate_detector(detector):
+    correct, latencies = 0, []
+    for text, label in HELD_OUT:
+        start = time.perf_counter()
+        prediction = detector.is_lucky_draw_intent(text)
+        latencies.append(time.perf_counter() - start)
+        correct += prediction == label
+    return correct, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--with-llm", action="store_true", help="also run the full detector, calling the LLM on low confidence")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    classifier = IntentClassifier()
+    print(f"Trained local classifier in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    soft = sum(bool(SOFT_SIGNALS.search(text)) for text, _ in HELD_OUT)
+    print(f"{soft}/{len(HELD_OUT)} held-out messages hit SOFT_SIGNALS\n")
+
+    confidence = config.LUCKY_DRAW_INTENT_CONFIDENCE
+    decided, correct, latencies = evaluate_local(classifier, confidence)
+    print(f"Local classifier at confidence {confidence}:")
+    print(f"  coverage  {decided}/{len(HELD_OUT)} ({decided / len(HELD_OUT):.0%}) decided without the LLM")
+    print(f"  accuracy  {correct}/{decided} ({correct / decided if decided else 0:.0%}) on the messages it decided")
+    print(f"  latency   p50={statistics.median(latencies) * 1e6:.0f} µs  p95={percentile(latencies, 0.95) * 1e6:.0f} µs")
+
+    if args.with_llm:
+        detector = IntentDetector()
+        correct, latencies = evaluate_detector(detector)
+        print(f"\nFull detector (classifier + LLM fallback):")
+        print(f"  accuracy  {correct}/{len(HELD_OUT)} ({correct / len(HELD_OUT):.0%})")
+        print(f"  latency   p50={statistics.median(latencies) * 1000:.1f} ms  p95={percentile(latencies, 0.95) * 1000:.1f} ms")
+        _, cached = evaluate_detector(detector)
+        print(f"  cached    p50={statistics.median(cached) * 1e6:.0f} µs (repeat of the same messages)")
+
+if __name__ == "__main__":
+    main()
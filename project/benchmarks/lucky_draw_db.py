@@ -0,0 +1,83 @@
+"""Entries per second under concurrent lucky-draw submissions.
+
+Run from the project directory:
+
+    python -m benchmarks.lucky_draw_db --threads 8 --entries 2000
+
+Each worker thread does what a finished lucky-draw flow does: allocate a
+receipt number, check the phone number for an approved entry and insert the
+entry. The pooled WAL database with sequence-based numbering is compared to
+the previous scheme (a new connection per query, rollback journal and
+``MAX(receipt_no) + 1``), whose duplicate receipt numbers show up as failed
+inserts.
+"""
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from lucky_draw.database import LuckyDrawDB
+from lucky_draw.models import EntryStatus
+
+def submit(db, worker, i):
+    receipt_no = db.allocate_receipt_no()
+    phone = f"+6012{worker:03d}{i:05d}"
+    db.find_approved_by_phone(phone)
+    db.insert_entry(receipt_no, f"User {worker}-{i}", phone, f"user{worker}.{i}@example.com", 25.0, 95.0, EntryStatus.APPROVED)
+
+class LegacyDB(LuckyDrawDB):
+    """The previous access pattern: one connection per query and MAX()+1 numbering."""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.close()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+
+    def _get_conn(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def allocate_receipt_no(self):
+        return self.get_max_receipt_no() + 1
+
+def run(db, threads, entries):
+    per_thread = entries // threads
+    failures = []
+
+    def worker(n):
+        for i in range(per_thread):
+            try:
+                submit(db, n, i)
+            except sqlite3.Error as e:
+                failures.append(e)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * threads, elapsed, failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--entries", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, factory in (("legacy", LegacyDB), ("pooled", LuckyDrawDB)):
+            db = factory(str(Path(tmp) / f"{label}.db"))
+            attempted, elapsed, failures = run(db, args.threads, args.entries)
+            with db._get_conn() as conn:
+                stored = conn.execute("SELECT COUNT(*) FROM lucky_draw_entries").fetchone()[0]
+            print(f"{label:7s} {attempted / elapsed:8.0f} entries/s  "
+                  f"stored={stored}/{attempted}  failed={len(failures)}  ({args.threads} threads, {elapsed:.2f}s)")
+            db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Query latency, recall, RAM and disk of each Qdrant collection profile at scale.
+
+Run from the project directory against a Qdrant server (the embedded storage
+searches exhaustively and ignores index settings, so without --url it is
+only a smoke test):
+
+    python -m benchmarks.qdrant_profiles --url http://localhost:6333 --points 100000
+    python -m benchmarks.qdrant_profiles --url http://localhost:6333 --points 1000000 \\
+        --profiles low_memory --server-pid $(pgrep -x qdrant) --storage-dir /qdrant/storage
+
+For every profile in QDRANT_COLLECTION_PROFILES a collection is created with
+``create_profiled_collection`` and filled with --points synthetic child
+chunks: clustered unit vectors of --dim dimensions, with page_content and
+source/parent_id payloads shaped like real chunks. Once the server has
+finished indexing, --queries searches run with the profile's search params.
+Recall@k is measured against exact search on the same collection. RAM is
+the growth of the server's resident memory (--server-pid); run one profile
+per fresh server for clean numbers, as freed memory is not always returned
+to the OS. Disk is the size of the collection's directory (--storage-dir).
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import psutil
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+import config
+from db.vector_db_manager import create_profiled_collection, profile_search_params
+
+CLUSTERS = 512
+TEXT = ("The quarterly report describes revenue, operating costs and the outlook for each region, "
+        "with tables comparing results to the previous year and notes on methodology. ") * 8
+
+def dir_size_mb(path):
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file()) / (1024 * 1024)
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "p50": statistics.median(ordered) * 1000,
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+    }
+
+def synthetic_vectors(centers, n, seed):
+    rng = np.random.default_rng(seed)
+    vectors = centers[rng.integers(0, len(centers), n)] + rng.normal(scale=0.35, size=(n, centers.shape[1]))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+def insert_points(client, collection_name, centers, total, batch_size, payload_chars):
+    start = time.perf_counter()
+    for offset in range(0, total, batch_size):
+        vectors = synthetic_vectors(centers, min(batch_size, total - offset), seed=offset + 1)
+        client.upsert(
+            collection_name=collection_name,
+            points=[
+                qmodels.PointStruct(
+                    id=i,
+                    vector={"": vector.tolist()},
+                    payload={
+                        "page_content": TEXT[:payload_chars],
+                        "metadata": {"source": f"doc_{i // 500}.pdf", "parent_id": f"doc_{i // 500}_parent_{(i // 25) % 20}"},
+                    },
+                )
+                for i, vector in enumerate(vectors, start=offset)
+            ],
+            wait=True,
+        )
+    return time.perf_counter() - start
+
+def wait_until_indexed(client, collection_name, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if client.get_collection(collection_name).status == qmodels.CollectionStatus.GREEN:
+            return True
+        time.sleep(1)
+    return False
+
+def run_queries(client, collection_name, queries, k, search_params):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        points = client.query_points(collection_name, query=query.tolist(), limit=k, search_params=search_params).points
+        latencies.append(time.perf_counter() - start)
+        results.append({point.id for point in points})
+    return latencies, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=config.QDRANT_URL, help="Qdrant server URL (default: QDRANT_URL, else embedded storage)")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384, help="dense vector size (384 = all-MiniLM-L6-v2)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--payload-chars", type=int, default=config.CHILD_CHUNK_SIZE)
+    parser.add_argument("--profiles", nargs="+", default=list(config.QDRANT_COLLECTION_PROFILES), choices=list(config.QDRANT_COLLECTION_PROFILES))
+    parser.add_argument("--server-pid", type=int, help="Qdrant server process, to measure its memory")
+    parser.add_argument("--storage-dir", help="Qdrant server storage directory, to measure disk use")
+    parser.add_argument("--index-timeout", type=float, default=3600, help="seconds to wait for indexing")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark collections")
+    args = parser.parse_args()
+
+    local_dir = None
+    if args.url:
+        client = QdrantClient(url=args.url, timeout=300)
+        server = psutil.Process(args.server_pid) if args.server_pid else None
+        storage_dir = Path(args.storage_dir) / "collections" if args.storage_dir else None
+    else:
+        print("⚠️ No --url: using embedded storage, which ignores HNSW, quantization and payload indexes\n")
+        local_dir = tempfile.TemporaryDirectory()
+        client = QdrantClient(path=local_dir.name)
+        server = psutil.Process()
+        storage_dir = Path(local_dir.name) / "collection"
+
+    centers = np.random.default_rng(0).normal(size=(CLUSTERS, args.dim))
+    queries = synthetic_vectors(centers, args.queries, seed=10**9)
+    exact = qmodels.SearchParams(exact=True)
+
+    print(f"{args.points} points, {args.dim} dims, {args.queries} queries, recall@{args.k} against exact search\n")
+    print(f"{'profile':12s} {'insert/s':>9s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'recall':>7s} {'RAM MB':>8s} {'disk MB':>8s}")
+    for name in args.profiles:
+        profile = config.QDRANT_COLLECTION_PROFILES[name]
+        collection_name = f"bench_profile_{name}"
+        if client.collection_exists(collection_name):
+            client.delete_collection(collection_name)
+        rss_before = server.memory_info().rss if server else None
+
+        create_profiled_collection(client, collection_name, args.dim, profile)
+        insert_seconds = insert_points(client, collection_name, centers, args.points, args.batch_size, args.payload_chars)
+        if not wait_until_indexed(client, collection_name, args.index_timeout):
+            print(f"Warning: {collection_name} still indexing after {args.index_timeout:.0f}s, results include unindexed segments")
+
+        search_params = profile_search_params(profile)
+        run_queries(client, collection_name, queries[:10], args.k, search_params)  # warm-up
+        latencies, approximate = run_queries(client, collection_name, queries, args.k, search_params)
+        _, truth = run_queries(client, collection_name, queries, args.k, exact)
+        recall = statistics.fmean(len(a & t) / len(t) for a, t in zip(approximate, truth) if t)
+
+        ram = f"{(server.memory_info().rss - rss_before) / (1024 * 1024):8.0f}" if server else f"{'-':>8s}"
+        disk = f"{dir_size_mb(storage_dir / collection_name):8.0f}" if storage_dir else f"{'-':>8s}"
+        p = percentiles(latencies)
+        print(f"{name:12s} {args.points / insert_seconds:9.0f} {p['p50']:8.2f} {p['p95']:8.2f} {p['p99']:8.2f} {recall:7.3f} {ram} {disk}")
+
+        if not args.keep:
+            client.delete_collection(collection_name)
+
+    client.close()
+    if local_dir is not None:
+        local_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
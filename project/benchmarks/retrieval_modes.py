@@ -0,0 +1,172 @@
+"""Compare two-hop and one-hop retrieval on the current knowledge base or a synthetic one.
+
+Run from the project directory against an already populated index, or with
+--synthetic-docs to index generated documents into a temporary directory:
+
+    python -m benchmarks.retrieval_modes --queries 50
+    python -m benchmarks.retrieval_modes --synthetic-docs 200 --queries 100
+    python -m benchmarks.retrieval_modes --end-to-end --queries 10   # needs Ollama
+
+Retrieval-level numbers time the tool calls the agent makes in each mode
+(``search_child_chunks`` + ``retrieve_parent_chunks`` vs. a single
+``search_with_parent_context``) and need no LLM. ``--end-to-end`` runs the
+full agent graph in both modes, which also captures the extra LLM round trip
+of the two-hop design; the system is initialized once and only the graph is
+recompiled when switching modes.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from langchain_core.messages import HumanMessage
+from qdrant_client.http import models as qmodels
+import config
+from core.document_manager import DocumentManager
+from core.rag_system import RAGSystem
+from rag_agent.tools import ToolFactory
+
+TOPICS = {
+    "finance": "revenue margin forecast quarter ledger audit liquidity dividend capital expense budget invoice".split(),
+    "biology": "protein enzyme cell membrane genome mutation receptor pathway tissue organism sequence culture".split(),
+    "networks": "packet router latency bandwidth protocol socket topology congestion throughput handshake switch".split(),
+    "climate": "emission carbon aerosol ocean glacier precipitation drought forcing anomaly sediment monsoon".split(),
+    "law": "contract liability statute clause plaintiff tribunal precedent damages arbitration license breach".split(),
+}
+COMMON = "the of and a to in is that for with as on by this are from results method analysis data shows".split()
+
+def dir_size_mb(path):
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file()) / (1024 * 1024)
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "p50": statistics.median(ordered) * 1000,
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "mean": statistics.fmean(ordered) * 1000,
+    }
+
+def sample_queries(collection, n):
+    """Use the opening words of random child chunks as realistic in-domain queries."""
+    result = collection.client.query_points(
+        collection_name=collection.collection_name,
+        query=qmodels.SampleQuery(sample=qmodels.Sample.RANDOM),
+        limit=n,
+        with_payload=True,
+    )
+    return [" ".join(p.payload.get("page_content", "").split()[:12]) for p in result.points]
+
+def write_synthetic_corpus(out_dir, docs, seed=0):
+    """Markdown documents of a few titled sections each, every document drawing on one topic's vocabulary."""
+    rng = random.Random(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(docs):
+        topic = rng.choice(sorted(TOPICS))
+        sections = []
+        for s in range(rng.randint(4, 10)):
+            paragraphs = [
+                " ".join(rng.choice(TOPICS[topic]) if rng.random() < 0.4 else rng.choice(COMMON) for _ in range(rng.randint(60, 160)))
+                for _ in range(rng.randint(2, 6))
+            ]
+            sections.append(f"## {topic.title()} section {s + 1}\n\n" + "\n\n".join(paragraphs))
+        path = out_dir / f"synthetic_{topic}_{i:05d}.md"
+        path.write_text(f"# {topic.title()} report {i}\n\n" + "\n\n".join(sections), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+def bench_retrieval(factory, queries, limit):
+    two_hop, one_hop, two_hop_chars, one_hop_chars = [], [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = factory._search_child_chunks(query, limit)
+        first_parent = next((line.split(": ", 1)[1] for line in hits.splitlines() if line.startswith("Parent ID: ")), None)
+        parent = factory._retrieve_parent_chunks(first_parent) if first_parent else ""
+        two_hop.append(time.perf_counter() - start)
+        two_hop_chars.append(len(hits) + len(parent))
+
+        start = time.perf_counter()
+        combined = factory._search_with_parent_context(query, limit)
+        one_hop.append(time.perf_counter() - start)
+        one_hop_chars.append(len(combined))
+
+    return {
+        "two_hop": {**percentiles(two_hop), "context_chars": statistics.fmean(two_hop_chars)},
+        "one_hop": {**percentiles(one_hop), "context_chars": statistics.fmean(one_hop_chars)},
+    }
+
+def bench_end_to_end(rag_system, queries):
+    async def run():
+        results = {}
+        for mode in ("two_hop", "one_hop"):
+            config.RETRIEVAL_MODE = mode
+            rag_system.build_agent_graph()
+            # Otherwise the second mode would be answered from the first mode's cached answers
+            rag_system.invalidate_answers()
+            latencies = []
+            for query in queries:
+                run_config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+                start = time.perf_counter()
+                await rag_system.agent_graph.ainvoke({"messages": [HumanMessage(content=query)]}, run_config)
+                latencies.append(time.perf_counter() - start)
+            results[mode] = percentiles(latencies)
+        return results
+
+    # One event loop for every run, as in the app
+    return asyncio.run(run())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=50, help="number of sampled queries")
+    parser.add_argument("--limit", type=int, default=7, help="child chunks per search")
+    parser.add_argument("--end-to-end", action="store_true", help="also run the full agent graph in both modes")
+    parser.add_argument("--synthetic-docs", type=int, default=0, help="index this many generated documents in a temporary directory instead")
+    args = parser.parse_args()
+
+    work_dir = None
+    if args.synthetic_docs:
+        work_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        # Every store path in config is relative, so the whole index lands in the temporary directory
+        os.chdir(work_dir.name)
+
+    rag_system = RAGSystem()
+    rag_system.vector_db.create_collection(rag_system.collection_name)
+    if args.synthetic_docs:
+        start = time.perf_counter()
+        paths = write_synthetic_corpus(Path("synthetic_src"), args.synthetic_docs)
+        added, _ = DocumentManager(rag_system).add_documents(paths)
+        print(f"Indexed {added} synthetic documents in {time.perf_counter() - start:.1f}s")
+    collection = rag_system.vector_db.get_collection(rag_system.collection_name)
+    factory = ToolFactory(collection, rag_system.parent_store, search_params=rag_system.vector_db.search_params())
+    queries = sample_queries(collection, args.queries)
+    if not queries:
+        print("The collection is empty; index some documents first.")
+        return
+
+    # Warm up models and caches so the first query doesn't skew the percentiles
+    bench_retrieval(factory, queries[:3], args.limit)
+
+    print(f"\nIndex size: qdrant {dir_size_mb(config.QDRANT_DB_PATH):.1f} MB, "
+          f"parent store {dir_size_mb(config.PARENT_STORE_PATH):.1f} MB "
+          f"(both modes read the same deduplicated parent store)")
+
+    print(f"\nRetrieval latency over {len(queries)} queries (ms):")
+    for mode, stats in bench_retrieval(factory, queries, args.limit).items():
+        print(f"  {mode:8s} p50={stats['p50']:7.1f}  p95={stats['p95']:7.1f}  mean={stats['mean']:7.1f}  context={stats['context_chars']:.0f} chars")
+
+    if args.end_to_end:
+        rag_system.initialize()
+        print(f"\nEnd-to-end latency over {len(queries)} queries (ms):")
+        for mode, stats in bench_end_to_end(rag_system, queries).items():
+            print(f"  {mode:8s} p50={stats['p50']:9.1f}  p95={stats['p95']:9.1f}  mean={stats['mean']:9.1f}")
+
+    if work_dir is not None:
+        os.chdir(Path(__file__).resolve().parent.parent)
+        work_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
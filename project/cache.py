@@ -0,0 +1,69 @@
+import sys
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and/or total size in bytes.
+
+    ``sizeof`` estimates the size of a value; it is only called when
+    ``max_bytes`` is set. Hit, miss and eviction counters are kept so the
+    bounds can be tuned from ``stats()``.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=sys.getsizeof):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        self.__lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.__lock:
+            if key not in self.__entries:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return self.__entries[key][0]
+
+    def put(self, key, value) -> None:
+        size = self.sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self.__lock:
+            if key in self.__entries:
+                self.__bytes -= self.__entries.pop(key)[1]
+            self.__entries[key] = (value, size)
+            self.__bytes += size
+            while (self.max_entries and len(self.__entries) > self.max_entries) or (self.max_bytes and self.__bytes > self.max_bytes):
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.__bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, keys) -> None:
+        with self.__lock:
+            for key in keys:
+                entry = self.__entries.pop(key, None)
+                if entry is not None:
+                    self.__bytes -= entry[1]
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def stats(self) -> dict:
+        with self.__lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.__entries),
+                "bytes": self.__bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,11 +1,53 @@
+import os
+
 # --- Directory Configuration ---
 MARKDOWN_DIR = "markdown_docs"
 PARENT_STORE_PATH = "parent_store"
+# "sqlite" keeps every parent chunk in PARENT_STORE_PATH/parents.db; "json" writes one file per parent
+PARENT_STORE_BACKEND = "sqlite"
+# Size budget of the in-memory LRU cache in front of the parent store
+PARENT_CACHE_MAX_MB = 64
 QDRANT_DB_PATH = "qdrant_db"
 
 # --- Qdrant Configuration ---
 CHILD_COLLECTION = "document_child_chunks"
 SPARSE_VECTOR_NAME = "sparse"
+# Qdrant server URL (e.g. "http://localhost:6333"); None uses the embedded storage at QDRANT_DB_PATH,
+# which searches exhaustively and ignores HNSW, quantization and payload index settings
+QDRANT_URL = None
+
+# --- Qdrant Collection Profile Configuration ---
+# Profile applied when the child collection is created; switching profiles needs "Clear All" or a --rebuild
+QDRANT_COLLECTION_PROFILE = "default"
+# hnsw: HNSW graph parameters (m, ef_construct, on_disk); quantization: int8 scalar quantization of the
+# dense vectors; on_disk: keep original vectors and the sparse index memory-mapped instead of in RAM;
+# search: query-time hnsw_ef and quantization rescoring/oversampling; payload_indexes: filtered fields
+QDRANT_COLLECTION_PROFILES = {
+    # Everything in RAM, Qdrant's default graph
+    "default": {
+        "payload_indexes": {"metadata.source": "keyword", "metadata.parent_id": "keyword"},
+        "hnsw": {"m": 16, "ef_construct": 100},
+        "quantization": None,
+        "on_disk": False,
+        "search": {"hnsw_ef": 128},
+    },
+    # Denser graph and wider search beam, for large corpora where recall matters more than RAM
+    "high_recall": {
+        "payload_indexes": {"metadata.source": "keyword", "metadata.parent_id": "keyword"},
+        "hnsw": {"m": 32, "ef_construct": 256},
+        "quantization": None,
+        "on_disk": False,
+        "search": {"hnsw_ef": 256},
+    },
+    # int8 copies in RAM (4x smaller), originals on disk and only read to rescore the top candidates
+    "low_memory": {
+        "payload_indexes": {"metadata.source": "keyword", "metadata.parent_id": "keyword"},
+        "hnsw": {"m": 16, "ef_construct": 100},
+        "quantization": {"quantile": 0.99, "always_ram": True},
+        "on_disk": True,
+        "search": {"hnsw_ef": 128, "rescore": True, "oversampling": 2.0},
+    },
+}
 
 # --- Model Configuration ---
 DENSE_MODEL = "sentence-transformers/all-mpnet-base-v2"
@@ -23,6 +65,119 @@ HEADERS_TO_SPLIT_ON = [
     ("##", "H2"),
     ("###", "H3")
 ]
+# Worker processes that chunk markdown files during ingestion and index builds (1 = in-process)
+CHUNKING_WORKERS = 1
 
 # --- Lucky Draw Configuration ---
 LUCKY_DRAW_DB_PATH = "lucky_draw.db"
+# Long-lived WAL connections shared by the lucky-draw flow
+LUCKY_DRAW_DB_POOL_SIZE = 4
+# Per-session flow state: sessions idle this long leave the flow; persisted flows survive restarts
+LUCKY_DRAW_FLOW_TTL_SECONDS = 30 * 60
+LUCKY_DRAW_FLOW_PERSIST = False
+# Messages with soft signals (win, enter, prize...) are decided locally when the classifier is at least this confident
+LUCKY_DRAW_INTENT_CONFIDENCE = 0.9
+# Decisions cached per normalized message
+LUCKY_DRAW_INTENT_CACHE_SIZE = 1024
+
+# --- Ingestion Configuration ---
+# Number of processes used to convert PDFs to Markdown (1 = convert in-process, one at a time)
+PDF_CONVERSION_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Child chunks from several documents are merged into embedding batches of this size
+EMBEDDING_BATCH_SIZE = 256
+# Maximum number of items waiting between two pipeline stages
+INGESTION_QUEUE_SIZE = 4
+
+# --- Ingestion Job Configuration ---
+# Background threads running queued uploads and syncs (1 = one job at a time)
+INGESTION_JOB_WORKERS = 1
+# Smaller embedding batches than offline builds, so a chat turn never waits long for the model
+INGESTION_JOB_BATCH_SIZE = 64
+# PDF conversion processes per job, leaving cores free for chat
+INGESTION_JOB_CONVERSION_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+# Longest an embedding batch, Qdrant write or catalog suggestion call waits for in-flight chat turns before it runs anyway
+INGESTION_JOB_MAX_YIELD_SECONDS = 10
+# Finished jobs kept for the status list
+INGESTION_JOB_HISTORY = 50
+# How often the Documents tab refreshes job status
+INGESTION_JOB_POLL_SECONDS = 2
+
+# --- Embedding Cache Configuration ---
+# On-disk cache of child chunk embeddings keyed by sha256(model name + chunk text)
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_PATH = "embedding_cache/embeddings.db"
+EMBEDDING_CACHE_MAX_MB = 2048
+
+# --- Index Sync Configuration ---
+# Tracks content hashes and point IDs of everything indexed, for incremental re-indexing
+INDEX_MANIFEST_PATH = "index_manifest.db"
+
+# --- Offline Index Build Configuration ---
+# Progress journal of python -m core.build_index, used to resume an interrupted build
+INDEX_BUILD_JOURNAL_PATH = "index_build_journal.json"
+# Child chunks per embedding batch and Qdrant write when building offline
+INDEX_BUILD_BATCH_SIZE = 1024
+# Documents ingested between two journal updates
+INDEX_BUILD_STEP_DOCS = 100
+
+# --- Document Catalog Configuration ---
+# Per-document snippets and suggested questions, built at ingestion for conversational replies and no-answer fallbacks
+DOCUMENT_CATALOG_PATH = "document_catalog.db"
+CATALOG_SNIPPETS_PER_DOC = 3
+CATALOG_MAX_SUGGESTIONS = 5
+
+# --- Retrieval Configuration ---
+# "two_hop": the agent searches child chunks, then asks for parent chunks in a separate tool call
+# "one_hop": a single tool returns matching child hits together with their parent sections
+RETRIEVAL_MODE = "two_hop"
+
+# --- Chat Configuration ---
+# Stream progress updates and answer tokens to the chat instead of waiting for the full response
+STREAM_RESPONSES = True
+# Number of chat requests Gradio runs at once (they are async, so this mostly bounds load on Ollama)
+CHAT_CONCURRENCY_LIMIT = 32
+
+# --- Conversational Router Configuration ---
+# Recognize greetings, thanks and questions about the assistant locally instead of with the query-analysis LLM call
+CONVERSATIONAL_ROUTER_ENABLED = True
+# Minimum similarity to a conversational exemplar (dense embeddings) for messages not caught by the patterns
+CONVERSATIONAL_ROUTER_SIMILARITY = 0.8
+# Longer messages are never routed by exemplar similarity, since they likely carry a topic
+CONVERSATIONAL_ROUTER_MAX_WORDS = 8
+
+# --- Summarization Configuration ---
+# The conversation summary is updated in the background after each reply, from at most this many tokens of the new turn
+SUMMARY_WINDOW_TOKENS = 2000
+
+# --- Session Configuration ---
+# Each browser session gets its own conversation thread; idle or excess sessions are evicted with their checkpoints
+SESSION_TTL_SECONDS = 2 * 60 * 60
+MAX_SESSIONS = 1000
+# With the in-memory checkpointer, evict the oldest sessions when the process RSS exceeds this (None disables the check)
+SESSION_MEMORY_LIMIT_MB = 4096
+
+# --- Checkpoint Configuration ---
+# "sqlite" persists conversation threads to CHECKPOINT_DB_PATH; "memory" keeps them in-process only
+CHECKPOINT_BACKEND = "sqlite"
+CHECKPOINT_DB_PATH = "checkpoints/checkpoints.db"
+# Checkpoints kept per thread after each turn (older ones and finished sub-question branches are pruned)
+CHECKPOINT_KEEP_LAST = 3
+# How often every thread is pruned and the database vacuumed (0 disables)
+CHECKPOINT_COMPACTION_INTERVAL_SECONDS = 6 * 60 * 60
+# Compaction deletes threads whose session has not been seen for this long, and threads no session refers to
+CHECKPOINT_THREAD_MAX_AGE_SECONDS = SESSION_TTL_SECONDS
+
+# --- Answer Cache Configuration ---
+# Reuse the final answer when the rewritten questions are semantically the same as a recently answered one
+ANSWER_CACHE_ENABLED = True
+# Minimum cosine similarity between the dense embeddings of the rewritten questions to count as a hit
+ANSWER_CACHE_SIMILARITY = 0.95
+ANSWER_CACHE_TTL_SECONDS = 24 * 60 * 60
+ANSWER_CACHE_MAX_ENTRIES = 1000
+
+# --- Retrieval Cache Configuration ---
+# Cache query embeddings and hybrid search hits per (corpus version, normalized query, limit, threshold)
+RETRIEVAL_CACHE_ENABLED = True
+RETRIEVAL_CACHE_MAX_ENTRIES = 4096
+# Print hit-rate stats every N searches (0 disables)
+RETRIEVAL_CACHE_LOG_INTERVAL = 100
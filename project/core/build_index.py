@@ -0,0 +1,160 @@
+"""Build or rebuild the knowledge base from a directory of PDFs/markdown, outside the web app.
+
+Run from the project directory, with the app stopped (the local Qdrant
+storage can only be opened by one process):
+
+    python -m core.build_index /data/papers
+    python -m core.build_index /data/papers --rebuild --batch-size 1024 --chunking-workers 4
+    python -m core.build_index /data/papers --suggest-questions
+
+Documents are ingested in steps of --step files through the same pipeline
+as uploads. Each finished document is recorded in the index manifest and
+each finished step in a JSON journal, so an interrupted build run again with
+the same arguments skips what was already indexed (and, for --rebuild, does
+not clear the index a second time). Documents that failed are skipped on
+resume unless --retry-failed is given.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import config
+from core.document_manager import DocumentManager
+from core.ingestion_pipeline import IngestionPipeline
+from core.rag_system import RAGSystem
+
+SUFFIXES = (".pdf", ".md")
+
+
+class BuildJournal:
+    """Progress of one index build, rewritten atomically after every step."""
+
+    def __init__(self, path=config.INDEX_BUILD_JOURNAL_PATH):
+        self.path = Path(path)
+        self.data = None
+
+    def resume(self, source_dir: str):
+        """Load the journal of an unfinished build of ``source_dir``; returns False if there is none."""
+        if not self.path.exists():
+            return False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable build journal {self.path}: {e}")
+            return False
+        if data.get("status") != "running" or data.get("source_dir") != source_dir:
+            return False
+        self.data = data
+        return True
+
+    def start(self, source_dir: str, rebuild: bool):
+        self.data = {
+            "source_dir": source_dir,
+            "rebuild": rebuild,
+            "status": "running",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "indexed": 0,
+            "skipped": 0,
+            "failed": [],
+            "chunks": 0,
+            "elapsed_seconds": 0.0,
+            "embed_seconds": 0.0,
+            "write_seconds": 0.0,
+        }
+        self.save()
+
+    def record_step(self, indexed, skipped, failed, stats, elapsed):
+        self.data["indexed"] += indexed
+        self.data["skipped"] += skipped
+        self.data["failed"] = sorted(set(self.data["failed"]) | set(failed))
+        self.data["chunks"] += stats["chunks"]
+        self.data["elapsed_seconds"] += elapsed
+        self.data["embed_seconds"] += stats["embed_seconds"]
+        self.data["write_seconds"] += stats["write_seconds"]
+        self.save()
+
+    def finish(self):
+        self.data["status"] = "finished"
+        self.data["finished_at"] = datetime.now(timezone.utc).isoformat()
+        self.save()
+
+    def save(self):
+        self.data["updated_at"] = datetime.now(timezone.utc).isoformat()
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source_dir", help="directory containing .pdf and/or .md files")
+    parser.add_argument("--rebuild", action="store_true", help="clear the collection, parent store, manifest and catalog first")
+    parser.add_argument("--batch-size", type=int, default=config.INDEX_BUILD_BATCH_SIZE, help="child chunks per embedding batch and Qdrant write")
+    parser.add_argument("--chunking-workers", type=int, default=config.CHUNKING_WORKERS, help="processes that chunk markdown files (1 = in-process)")
+    parser.add_argument("--step", type=int, default=config.INDEX_BUILD_STEP_DOCS, help="documents per journaled step")
+    parser.add_argument("--retry-failed", action="store_true", help="retry documents that failed earlier in a resumed build")
+    parser.add_argument("--suggest-questions", action="store_true", help="generate catalog suggestions with the LLM (one call per document)")
+    return parser.parse_args(argv)
+
+
+def print_report(data):
+    elapsed = max(data["elapsed_seconds"], 1e-9)
+    print("\nIndex build report")
+    print(f"  documents   indexed={data['indexed']}  skipped={data['skipped']}  failed={len(data['failed'])}")
+    print(f"  throughput  {data['indexed'] / elapsed:.2f} docs/s  {data['chunks'] / elapsed:.1f} chunks/s  ({elapsed:.1f}s)")
+    print(f"  embedding   {data['embed_seconds']:.1f}s ({data['embed_seconds'] / elapsed:.0%} of wall time)")
+    print(f"  writes      {data['write_seconds']:.1f}s ({data['write_seconds'] / elapsed:.0%} of wall time)")
+    if data["failed"]:
+        print(f"  failed      {', '.join(data['failed'][:20])}{' ...' if len(data['failed']) > 20 else ''}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    source_dir = Path(args.source_dir).resolve()
+    if not source_dir.is_dir():
+        raise SystemExit(f"Not a directory: {source_dir}")
+    doc_paths = sorted(p for p in source_dir.iterdir() if p.suffix.lower() in SUFFIXES)
+
+    rag_system = RAGSystem()
+    doc_manager = DocumentManager(rag_system)
+    if args.suggest_questions:
+        from langchain_ollama import ChatOllama
+        rag_system.llm = ChatOllama(model=config.LLM_MODEL, temperature=config.LLM_TEMPERATURE)
+
+    journal = BuildJournal()
+    if journal.resume(str(source_dir)):
+        print(f"Resuming build started at {journal.data['started_at']} "
+              f"({journal.data['indexed']} indexed, {len(journal.data['failed'])} failed so far)")
+    else:
+        journal.start(str(source_dir), args.rebuild)
+        if args.rebuild:
+            print("Clearing the existing index...")
+            doc_manager.clear_index()
+    rag_system.vector_db.create_collection(rag_system.collection_name)
+
+    if not args.retry_failed:
+        known_failures = set(journal.data["failed"])
+        doc_paths = [p for p in doc_paths if p.stem not in known_failures]
+
+    print(f"Indexing {len(doc_paths)} documents from {source_dir}")
+    for start in range(0, len(doc_paths), args.step):
+        step_paths = doc_paths[start:start + args.step]
+        pipeline = IngestionPipeline(rag_system, batch_size=args.batch_size, chunking_workers=args.chunking_workers)
+        started = time.perf_counter()
+        added, skipped = doc_manager.add_documents([str(p) for p in step_paths], pipeline=pipeline)
+        elapsed = time.perf_counter() - started
+
+        failed = sorted(pipeline.failed)
+        journal.record_step(added, skipped - len(failed), failed, pipeline.stats, elapsed)
+        done = start + len(step_paths)
+        print(f"[{done}/{len(doc_paths)}] +{added} indexed, {skipped - len(failed)} unchanged, {len(failed)} failed  "
+              f"{added / max(elapsed, 1e-9):.2f} docs/s  {pipeline.stats['chunks'] / max(elapsed, 1e-9):.1f} chunks/s")
+
+    journal.finish()
+    print_report(journal.data)
+
+
+if __name__ == "__main__":
+    main()
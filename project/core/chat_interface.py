@@ -1,32 +1,124 @@
-from langchain_core.messages import HumanMessage
+import asyncio
+from langchain_core.messages import HumanMessage, AIMessageChunk
 from lucky_draw import LuckyDrawController
-from config import LUCKY_DRAW_DB_PATH
+from config import LUCKY_DRAW_DB_PATH, STREAM_RESPONSES
+from core.session_registry import SessionRegistry
+
+# Nodes whose LLM output is the user-facing answer and is streamed token by token
+STREAMED_NODES = {"aggregate", "conversational_response"}
 
 class ChatInterface:
 
     def __init__(self, rag_system):
         self.rag_system = rag_system
         self.lucky_draw = LuckyDrawController(LUCKY_DRAW_DB_PATH)
+        self.sessions = SessionRegistry(on_evict=rag_system.delete_thread, store=rag_system.checkpoints)
+        self._background_tasks = set()
 
-    def chat(self, message, history):
+    async def chat(self, message, history, session_id):
+        """Yield the reply as it is produced: progress updates first, then the growing answer."""
 
         if not self.rag_system.agent_graph:
-            return "⚠️ System not initialized!"
+            yield "⚠️ System not initialized!"
+            return
+
+        # Looking up and saving the session's thread is blocking SQLite
+        session = await asyncio.to_thread(self.sessions.get, session_id)
+        reply = None
+        async with session.lock:
+            # Under the session lock, so a double submit can't advance the same lucky-draw flow twice.
+            # Lucky-draw handling does blocking SQLite (and possibly LLM) calls
+            lucky_draw_response = await asyncio.to_thread(self.lucky_draw.handle, message, session_id)
+            if lucky_draw_response is not None:
+                yield lucky_draw_response
+                return
+
+            # Background ingestion holds off its embedding batches and Qdrant writes until the turn is done
+            with self.rag_system.interactive_gate.interactive():
+                try:
+                    async for reply in self._run_turn(message, session.thread_id):
+                        yield reply
+                finally:
+                    # Only the latest checkpoints are needed to continue the conversation
+                    await asyncio.to_thread(self.rag_system.checkpoints.prune_thread, session.thread_id)
 
-        lucky_draw_response = self.lucky_draw.handle(message)
-        if lucky_draw_response is not None:
-            return lucky_draw_response
+        # Reached once the final reply has been delivered
+        if reply and not reply.startswith("❌"):
+            self._start_background(self._summarize(session, message))
 
+    def _start_background(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        # The event loop only keeps weak references to tasks
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _summarize(self, session, message):
+        # Holding the session lock makes the next turn wait for (and read) the updated summary
+        async with session.lock:
+            try:
+                await self.rag_system.summarize_turn(session.thread_id, message.strip())
+                await asyncio.to_thread(self.rag_system.checkpoints.prune_thread, session.thread_id)
+            except Exception as e:
+                print(f"Warning: Could not update conversation summary: {e}")
+
+    async def _run_turn(self, message, thread_id):
         try:
-            result = self.rag_system.agent_graph.invoke(
-                {"messages": [HumanMessage(content=message.strip())]},
-                self.rag_system.get_config()
-            )
-            return result["messages"][-1].content
+            inputs = {"messages": [HumanMessage(content=message.strip())]}
+            run_config = self.rag_system.get_config(thread_id)
+
+            if not STREAM_RESPONSES:
+                result = await self.rag_system.agent_graph.ainvoke(inputs, run_config)
+                yield result["messages"][-1].content
+                return
+
+            async for partial_reply in self._stream(inputs, run_config):
+                yield partial_reply
+            # The final message may differ from the streamed tokens (e.g. appended suggestions)
+            state = await self.rag_system.agent_graph.aget_state(run_config)
+            yield state.values["messages"][-1].content
 
         except Exception as e:
-            return f"❌ Error: {str(e)}"
+            yield f"❌ Error: {str(e)}"
+
+    async def _stream(self, inputs, run_config):
+        answer, answer_id = "", None
+        sub_questions, total, answered = {}, 0, 0
+        yield "🧠 Analyzing your question..."
+
+        async for namespace, mode, chunk in self.rag_system.agent_graph.astream(
+            inputs, run_config, stream_mode=["updates", "messages"], subgraphs=True
+        ):
+            if mode == "messages":
+                token, metadata = chunk
+                if metadata.get("langgraph_node") not in STREAMED_NODES or not isinstance(token, AIMessageChunk) or not token.content:
+                    continue
+                # Only the first LLM call of the answer node is the answer itself
+                answer_id = answer_id or token.id
+                if token.id == answer_id:
+                    answer += token.content
+                    yield answer
+                continue
+
+            if answer:
+                continue
+            for node, update in (chunk or {}).items():
+                if not namespace:
+                    if node == "analyze_rewrite" and update and update.get("rewrittenQuestions"):
+                        total = len(update["rewrittenQuestions"])
+                        yield f"🔎 Searching the documents for {total} sub-question(s)..."
+                    continue
+                # Each parallel process_question branch runs in its own subgraph namespace
+                index = sub_questions.setdefault(namespace[0], len(sub_questions) + 1)
+                if node == "tools":
+                    yield f"🔎 Searching for sub-question {index}/{total}..."
+                elif node == "extract_answer":
+                    answered += 1
+                    yield f"📝 Answered {answered}/{total} sub-question(s)..."
+
+    def clear_session(self, session_id):
+        self.sessions.reset(session_id)
+        self.lucky_draw.reset(session_id)
 
-    def clear_session(self):
-        self.rag_system.reset_thread()
-        self.lucky_draw.state.reset()
+    def end_session(self, session_id):
+        self.sessions.remove(session_id)
+        self.lucky_draw.reset(session_id)
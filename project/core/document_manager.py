@@ -1,7 +1,11 @@
 from pathlib import Path
 import shutil
 import config
-from util import pdfs_to_markdowns
+from core.ingestion_pipeline import IngestionPipeline
+from langchain_core.messages import SystemMessage, HumanMessage
+from db.index_manifest import file_hash
+from db.document_catalog import select_snippets, parse_questions
+from rag_agent.prompts import get_suggestion_prompt
 
 class DocumentManager:
 
@@ -10,7 +14,7 @@ class DocumentManager:
         self.markdown_dir = Path(config.MARKDOWN_DIR)
         self.markdown_dir.mkdir(parents=True, exist_ok=True)
         
-    def add_documents(self, document_paths, progress_callback=None):
+    def add_documents(self, document_paths, progress_callback=None, pipeline=None):
         if not document_paths:
             return 0, 0
             
@@ -22,41 +26,115 @@ class DocumentManager:
             
         added = 0
         skipped = 0
-            
-        for i, doc_path in enumerate(document_paths):
-            if progress_callback:
-                progress_callback((i + 1) / len(document_paths), f"Processing {Path(doc_path).name}")
-                
-            doc_name = Path(doc_path).stem
-            md_path = self.markdown_dir / f"{doc_name}.md"
-            
-            if md_path.exists():
-                skipped += 1
-                continue
-                
-            try:            
-                if Path(doc_path).suffix.lower() == ".md":
-                    shutil.copy(doc_path, md_path)
-                else:
-                    pdfs_to_markdowns(str(doc_path), overwrite=False)            
-                parent_chunks, child_chunks = self.rag_system.chunker.create_chunks_single(md_path)
-                
-                if not child_chunks:
-                    skipped += 1
-                    continue
-                
-                collection = self.rag_system.vector_db.get_collection(self.rag_system.collection_name)
-                collection.add_documents(child_chunks)
-                self.rag_system.parent_store.save_many(parent_chunks)
-                
-                added += 1
-                
-            except Exception as e:
-                print(f"Error processing {doc_path}: {e}")
+        pending = []
+
+        for doc_path in map(Path, document_paths):
+            indexed = self.rag_system.index_manifest.get_document(doc_path.stem)
+            if indexed and indexed["source_hash"] == file_hash(doc_path):
                 skipped += 1
-            
+            else:
+                pending.append(doc_path)
+
+        if pending:
+            pipeline = pipeline or IngestionPipeline(self.rag_system)
+            pipeline_added, pipeline_failed = pipeline.run(pending, progress_callback)
+            added += pipeline_added
+            skipped += pipeline_failed
+            # Before the catalog's LLM calls, so cached hits and answers stop being served as soon as the index changed
+            self.rag_system.bump_corpus_version()
+            self._update_catalog(pipeline.indexed, progress_callback, stop=pipeline.cancelled, yield_to=pipeline.yield_to)
+
         return added, skipped
     
+    def sync(self, progress_callback=None, pipeline=None):
+        """Reconcile the index with MARKDOWN_DIR.
+
+        Markdown files whose content changed since they were indexed are re-indexed
+        incrementally, and documents whose markdown was removed are dropped from the
+        vector store and parent store. Returns (updated, removed).
+        """
+        manifest = self.rag_system.index_manifest
+        md_paths = {p.stem: p for p in self.markdown_dir.glob("*.md")}
+
+        removed = 0
+        for doc_key in manifest.documents():
+            if doc_key not in md_paths:
+                self.rag_system.vector_db.delete_points(self.rag_system.collection_name, list(manifest.get_chunks(doc_key, "child")))
+                self.rag_system.parent_store.delete_many(list(manifest.get_chunks(doc_key, "parent")))
+                manifest.remove(doc_key)
+                self.rag_system.document_catalog.remove(doc_key)
+                removed += 1
+        if removed:
+            self.rag_system.bump_corpus_version()
+
+        changed = []
+        for doc_key, md_path in sorted(md_paths.items()):
+            indexed = manifest.get_document(doc_key)
+            if not indexed or indexed["md_hash"] != file_hash(md_path):
+                changed.append(md_path)
+
+        pipeline = pipeline or IngestionPipeline(self.rag_system)
+        updated, _ = pipeline.run(changed, progress_callback)
+        if changed:
+            # Even a document that failed part-way may have new points in the index
+            self.rag_system.bump_corpus_version()
+        self._update_catalog(pipeline.indexed, progress_callback, stop=pipeline.cancelled, yield_to=pipeline.yield_to)
+        if not pipeline.cancelled.is_set():
+            self.backfill_catalog(stop=pipeline.cancelled, yield_to=pipeline.yield_to)
+        return updated, removed
+
+    def _suggest_questions(self, doc_key, snippets):
+        llm = self.rag_system.llm
+        if llm is None or not snippets:
+            return []
+        try:
+            response = llm.invoke([
+                SystemMessage(content=get_suggestion_prompt()),
+                HumanMessage(content="\n".join(f"- [{doc_key}.pdf] {snippet}" for snippet in snippets))
+            ])
+            return parse_questions(response.content)
+        except Exception as e:
+            print(f"Warning: Could not generate suggested questions for {doc_key}: {e}")
+            return []
+
+    def _update_catalog(self, indexed, progress_callback=None, stop=None, yield_to=None):
+        # Documents skipped after a stop are picked up by backfill_catalog on the next start
+        for i, (doc_key, snippets) in enumerate(sorted(indexed.items()), start=1):
+            if stop is not None and stop.is_set():
+                return
+            if progress_callback:
+                progress_callback(i / len(indexed), f"Suggesting questions for {doc_key} ({i}/{len(indexed)})")
+            # Suggestions share the LLM with chat turns, so like embedding batches they wait for them
+            if yield_to is not None and self.rag_system.llm is not None:
+                yield_to.wait_idle(config.INGESTION_JOB_MAX_YIELD_SECONDS)
+            self.rag_system.document_catalog.upsert(doc_key, snippets, self._suggest_questions(doc_key, snippets))
+
+    def backfill_catalog(self, progress_callback=None, stop=None, yield_to=None):
+        """Catalog indexed documents that predate the catalog and suggest questions where none were generated.
+
+        Returns the number of documents (re)cataloged.
+        """
+        catalog = self.rag_system.document_catalog
+        missing = {}
+        for doc_key in self.rag_system.index_manifest.documents():
+            md_path = self.markdown_dir / f"{doc_key}.md"
+            if doc_key in catalog or not md_path.exists():
+                continue
+            try:
+                _, child_chunks = self.rag_system.chunker.create_chunks_single(md_path)
+            except Exception as e:
+                print(f"Warning: Could not catalog {doc_key}: {e}")
+                continue
+            missing[doc_key] = select_snippets(child_chunks)
+        # Entries written without an LLM (e.g. by build_index without --suggest-questions) only have snippets
+        if self.rag_system.llm is not None:
+            for doc_key, snippets in catalog.without_suggestions():
+                missing.setdefault(doc_key, snippets)
+        if missing:
+            print(f"Cataloging {len(missing)} previously indexed document(s)...")
+            self._update_catalog(missing, progress_callback, stop=stop, yield_to=yield_to)
+        return len(missing)
+
     def get_markdown_files(self):
         if not self.markdown_dir.exists():
             return []
@@ -66,7 +144,14 @@ class DocumentManager:
         if self.markdown_dir.exists():
             shutil.rmtree(self.markdown_dir)
             self.markdown_dir.mkdir(parents=True, exist_ok=True)
-        
+        self.clear_index()
+
+    def clear_index(self):
+        """Drop everything indexed but keep the markdown files."""
         self.rag_system.parent_store.clear_store()
+        self.rag_system.index_manifest.clear()
+        self.rag_system.document_catalog.clear()
         self.rag_system.vector_db.delete_collection(self.rag_system.collection_name)
-        self.rag_system.vector_db.create_collection(self.rag_system.collection_name)
\ No newline at end of file
+        self.rag_system.vector_db.create_collection(self.rag_system.collection_name)
+        # Only once the collection is empty, so a search racing the clear can't re-cache old hits under the new version
+        self.rag_system.bump_corpus_version()
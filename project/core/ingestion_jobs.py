@@ -0,0 +1,170 @@
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List, Optional
+import config
+from core.ingestion_pipeline import IngestionPipeline
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED = (JobStatus.DONE, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+@dataclass
+class IngestionJob:
+    id: int
+    kind: str  # "add", "sync" or "backfill"
+    paths: List[str]
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0
+    message: str = "Waiting for a worker"
+    result: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    pipeline: Optional[IngestionPipeline] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+
+class IngestionJobQueue:
+    """Runs document uploads and syncs on background worker threads.
+
+    ``submit`` and ``submit_sync`` return immediately with a job whose status,
+    progress and result can be polled; ``cancel`` stops a queued job before
+    it starts or a running one after its current batch. Jobs use smaller
+    embedding batches and fewer PDF conversion processes than an offline
+    build, and yield to chat turns through ``gate`` (an ``InteractiveGate``).
+    With a single worker (the default) jobs run one at a time, so two jobs
+    never index the same document concurrently.
+    """
+
+    def __init__(self, doc_manager, gate=None, workers=config.INGESTION_JOB_WORKERS, history=config.INGESTION_JOB_HISTORY):
+        self.doc_manager = doc_manager
+        self.gate = gate
+        self.history = history
+        self._jobs = OrderedDict()  # job id -> IngestionJob, oldest first
+        self._queue = queue.Queue()
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"ingestion-worker-{i}", daemon=True).start()
+
+    def submit(self, paths) -> IngestionJob:
+        paths = [paths] if isinstance(paths, str) else list(paths)
+        return self._enqueue(IngestionJob(id=next(self._ids), kind="add", paths=paths))
+
+    def submit_sync(self) -> IngestionJob:
+        return self._enqueue(IngestionJob(id=next(self._ids), kind="sync", paths=[]))
+
+    def submit_backfill(self) -> IngestionJob:
+        """Catalog documents indexed before the catalog existed or without suggested questions."""
+        return self._enqueue(IngestionJob(id=next(self._ids), kind="backfill", paths=[]))
+
+    def get(self, job_id: int) -> Optional[IngestionJob]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[IngestionJob]:
+        """All remembered jobs, newest first."""
+        with self._condition:
+            return list(reversed(self._jobs.values()))
+
+    def active(self) -> List[IngestionJob]:
+        return [job for job in self.jobs() if not job.finished]
+
+    def cancel(self, job_id: int) -> bool:
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            if job.status == JobStatus.QUEUED:
+                self._finish(job, JobStatus.CANCELLED, "Cancelled before it started")
+            else:
+                job.message = "Cancelling after the current batch..."
+                job.pipeline.cancel()
+            return True
+
+    def cancel_all(self, wait_seconds: Optional[float] = None) -> bool:
+        """Cancel every queued and running job and wait for running ones to stop; returns False on timeout."""
+        for job in self.active():
+            self.cancel(job.id)
+        with self._condition:
+            return self._condition.wait_for(lambda: all(job.finished for job in self._jobs.values()), wait_seconds)
+
+    def _enqueue(self, job: IngestionJob) -> IngestionJob:
+        with self._condition:
+            self._jobs[job.id] = job
+            self._trim()
+        self._queue.put(job)
+        return job
+
+    def _trim(self):
+        # Forget the oldest finished jobs beyond the history size
+        excess = len(self._jobs) - self.history
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def _finish(self, job: IngestionJob, status: JobStatus, result: str):
+        job.status = status
+        job.result = result
+        job.message = result
+        job.finished_at = time.time()
+        job.pipeline = None
+        self._trim()
+        self._condition.notify_all()
+
+    def _progress(self, job: IngestionJob, fraction: float, message: str):
+        job.progress = fraction
+        if not job.pipeline.cancelled.is_set():
+            job.message = message
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            with self._condition:
+                if job.status != JobStatus.QUEUED:
+                    continue
+                job.status = JobStatus.RUNNING
+                job.message = "Starting..."
+                job.pipeline = IngestionPipeline(
+                    self.doc_manager.rag_system,
+                    batch_size=config.INGESTION_JOB_BATCH_SIZE,
+                    conversion_workers=config.INGESTION_JOB_CONVERSION_WORKERS,
+                    yield_to=self.gate,
+                )
+            pipeline = job.pipeline
+
+            def progress_callback(fraction, message, job=job):
+                self._progress(job, fraction, message)
+
+            try:
+                if job.kind == "sync":
+                    updated, removed = self.doc_manager.sync(progress_callback, pipeline=pipeline)
+                    result = f"Re-indexed: {updated} | Removed: {removed}"
+                elif job.kind == "backfill":
+                    cataloged = self.doc_manager.backfill_catalog(progress_callback, stop=pipeline.cancelled, yield_to=self.gate)
+                    result = f"Cataloged: {cataloged}"
+                else:
+                    added, skipped = self.doc_manager.add_documents(job.paths, progress_callback, pipeline=pipeline)
+                    result = f"Added: {added} | Skipped: {skipped}"
+                status = JobStatus.DONE
+                if pipeline.cancelled.is_set():
+                    status, result = JobStatus.CANCELLED, f"Cancelled after indexing {len(pipeline.indexed)} document(s)"
+            except Exception as e:
+                print(f"Ingestion job #{job.id} failed: {e}")
+                status, result = JobStatus.FAILED, f"Failed: {e}"
+
+            with self._condition:
+                self._finish(job, status, result)
@@ -0,0 +1,319 @@
+import queue
+import shutil
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+import config
+from db.index_manifest import content_hash, file_hash, child_point_ids
+from db.document_catalog import select_snippets
+from util import convert_pdfs_parallel
+
+_DONE = object()
+
+@dataclass
+class DocumentPlan:
+    """What has to change in the index for one document, diffed against the manifest."""
+    doc_key: str
+    source_hash: str
+    md_hash: str
+    parent_hashes: Dict[str, str]
+    child_ids: List[str]
+    stale_child_ids: List[str]
+    stale_parent_ids: List[str]
+    is_new: bool
+    snippets: List[str] = field(default_factory=list)
+    # (parent_id, Document) of new or changed parents, saved once the child chunks are in the index
+    changed_parents: List = field(default_factory=list)
+
+
+@dataclass
+class Batch:
+    items: List = field(default_factory=list)
+    opened: List[DocumentPlan] = field(default_factory=list)
+    closed: List[DocumentPlan] = field(default_factory=list)
+
+
+class IngestionPipeline:
+    """Bounded-queue ingestion: convert -> chunk -> embed -> upsert.
+
+    Each stage runs on its own thread and hands work to the next one through a
+    queue of at most ``queue_size`` items, so CPU-bound PDF conversion overlaps
+    with embedding while memory stays bounded by the queue sizes rather than by
+    the size of the upload. Child chunks from consecutive documents are packed
+    into embedding batches of ``batch_size``. With ``chunking_workers`` > 1
+    markdown files are chunked in a process pool, in the order they arrive.
+
+    Every document is diffed against the index manifest: only new or changed
+    child chunks are embedded and upserted (under deterministic point IDs). Once
+    the document's new chunks are in, its new or changed parents are saved,
+    chunks that disappeared are deleted and the manifest is updated.
+
+    With ``yield_to`` (an ``InteractiveGate``), each embedding batch and Qdrant
+    write waits for in-flight chat turns first. ``cancel()`` stops a run after
+    the batch in progress; documents finished by then stay indexed.
+    """
+
+    def __init__(self, rag_system, batch_size=config.EMBEDDING_BATCH_SIZE, queue_size=config.INGESTION_QUEUE_SIZE,
+                 conversion_workers=config.PDF_CONVERSION_WORKERS, chunking_workers=config.CHUNKING_WORKERS, yield_to=None):
+        self.rag_system = rag_system
+        self.manifest = rag_system.index_manifest
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.conversion_workers = conversion_workers
+        self.chunking_workers = chunking_workers
+        self.yield_to = yield_to
+        self.cancelled = threading.Event()
+        self.markdown_dir = Path(config.MARKDOWN_DIR)
+        # doc_key -> content snippets of every document indexed by the last run, for the document catalog
+        self.indexed = {}
+        self.failed = set()
+        # Totals of the last run: child chunks embedded, and seconds spent embedding, writing to the index
+        # and waiting for chat turns
+        self.stats = {"chunks": 0, "embed_seconds": 0.0, "write_seconds": 0.0, "yield_seconds": 0.0}
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self, doc_paths, progress_callback=None):
+        """Ingest the given PDF/markdown paths; returns (added, failed).
+
+        A path may point at a markdown file already inside MARKDOWN_DIR, in which
+        case it is re-indexed in place.
+        """
+        doc_paths = [Path(p) for p in doc_paths]
+        if not doc_paths:
+            return 0, 0
+
+        self._lock = threading.Lock()
+        self.failed = set()
+        self._added = 0
+        self._total = len(doc_paths)
+        self.indexed = {}
+        self.stats = {"chunks": 0, "embed_seconds": 0.0, "write_seconds": 0.0, "yield_seconds": 0.0}
+
+        md_queue = queue.Queue(maxsize=self.queue_size)
+        batch_queue = queue.Queue(maxsize=self.queue_size)
+        embedded_queue = queue.Queue(maxsize=self.queue_size)
+
+        stages = [
+            threading.Thread(target=self._run_stage, args=(self._convert_stage, doc_paths, md_queue), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._chunk_stage, md_queue, batch_queue), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._embed_stage, batch_queue, embedded_queue), daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+
+        # Qdrant writes run on the caller's thread, which also keeps progress_callback on it
+        try:
+            self._upsert_stage(embedded_queue, progress_callback)
+        except BaseException:
+            # Let the other stages finish instead of leaving them blocked on full queues
+            self.cancel()
+            for _ in self._drain(embedded_queue):
+                pass
+            raise
+        finally:
+            for stage in stages:
+                stage.join()
+
+        return self._added, self._total - self._added
+
+    def _run_stage(self, stage, source, sink):
+        try:
+            stage(source, sink)
+        except Exception as e:
+            print(f"Ingestion stage {stage.__name__} failed: {e}")
+            # The stages upstream block on a full queue unless it keeps being emptied
+            self.cancel()
+            if isinstance(source, queue.Queue):
+                for _ in self._drain(source):
+                    pass
+        finally:
+            sink.put(_DONE)
+
+    @staticmethod
+    def _drain(source):
+        while (item := source.get()) is not _DONE:
+            yield item
+        # Put back so draining the same queue again ends right away
+        source.put(_DONE)
+
+    def _yield_to_interactive(self):
+        if self.yield_to is not None:
+            self.stats["yield_seconds"] += self.yield_to.wait_idle(config.INGESTION_JOB_MAX_YIELD_SECONDS)
+
+    def _mark_failed(self, doc_key, error):
+        print(f"Error processing {doc_key}: {error}")
+        with self._lock:
+            self.failed.add(doc_key)
+
+    def _convert_stage(self, doc_paths, md_queue):
+        pdf_paths = {}
+        for doc_path in doc_paths:
+            if self.cancelled.is_set():
+                return
+            try:
+                source_hash = file_hash(doc_path)
+            except Exception as e:
+                self._mark_failed(doc_path.stem, e)
+                continue
+
+            if doc_path.suffix.lower() != ".md":
+                pdf_paths[doc_path] = source_hash
+                continue
+            try:
+                md_path = self.markdown_dir / f"{doc_path.stem}.md"
+                if doc_path.resolve() != md_path.resolve():
+                    shutil.copy(doc_path, md_path)
+                elif indexed := self.manifest.get_document(doc_path.stem):
+                    # Re-indexed in place: keep the hash of the uploaded original so re-uploading it is still skipped
+                    source_hash = indexed["source_hash"]
+                md_queue.put((md_path, source_hash))
+            except Exception as e:
+                self._mark_failed(doc_path.stem, e)
+
+        for pdf_path, error in convert_pdfs_parallel(list(pdf_paths), self.markdown_dir, self.conversion_workers):
+            if self.cancelled.is_set():
+                return
+            if error is not None:
+                self._mark_failed(pdf_path.stem, error)
+            else:
+                md_queue.put((self.markdown_dir / f"{pdf_path.stem}.md", pdf_paths[pdf_path]))
+
+    def _plan(self, doc_key, source_hash, md_path, parent_chunks, child_chunks):
+        indexed = self.manifest.get_document(doc_key)
+        old_parents = self.manifest.get_chunks(doc_key, "parent")
+        old_children = self.manifest.get_chunks(doc_key, "child")
+
+        parent_hashes = {pid: content_hash(doc.page_content, doc.metadata) for pid, doc in parent_chunks}
+        child_ids = child_point_ids(doc_key, child_chunks)
+        current_children = set(child_ids)
+
+        return DocumentPlan(
+            doc_key=doc_key,
+            source_hash=source_hash,
+            md_hash=file_hash(md_path),
+            parent_hashes=parent_hashes,
+            child_ids=child_ids,
+            stale_child_ids=[cid for cid in old_children if cid not in current_children],
+            stale_parent_ids=[pid for pid in old_parents if pid not in parent_hashes],
+            is_new=indexed is None,
+            snippets=select_snippets(child_chunks),
+        ), old_parents, old_children
+
+    def _chunk_stage(self, md_queue, batch_queue):
+        # Chunking results come back in input order, so the source hashes can wait in a FIFO
+        source_hashes = deque()
+
+        def md_paths():
+            for md_path, source_hash in self._drain(md_queue):
+                if not self.cancelled.is_set():
+                    source_hashes.append(source_hash)
+                    yield md_path
+
+        batch = Batch()
+        for md_path, chunks, error in self.rag_system.chunker.iter_file_chunks(md_paths(), self.chunking_workers):
+            source_hash = source_hashes.popleft()
+            if self.cancelled.is_set():
+                continue
+            doc_key = md_path.stem
+            try:
+                if error is not None:
+                    raise error
+                parent_chunks, child_chunks = chunks
+                if not child_chunks:
+                    self._mark_failed(doc_key, "no content to index")
+                    continue
+                plan, old_parents, old_children = self._plan(doc_key, source_hash, md_path, parent_chunks, child_chunks)
+                plan.changed_parents = [(pid, doc) for pid, doc in parent_chunks if old_parents.get(pid) != plan.parent_hashes[pid]]
+            except Exception as e:
+                self._mark_failed(doc_key, e)
+                continue
+
+            if plan.is_new:
+                # Clears points a document may have from before it was tracked by the manifest
+                batch.opened.append(plan)
+            for chunk, point_id in zip(child_chunks, plan.child_ids):
+                if point_id in old_children:
+                    continue
+                batch.items.append((doc_key, chunk, point_id))
+                if len(batch.items) >= self.batch_size:
+                    batch_queue.put(batch)
+                    batch = Batch()
+            # Batches are processed in order, so by the time this batch is written
+            # every new chunk of the document has been upserted
+            batch.closed.append(plan)
+
+        if batch.items or batch.opened or batch.closed:
+            batch_queue.put(batch)
+
+    def _embed_stage(self, batch_queue, embedded_queue):
+        for batch in self._drain(batch_queue):
+            dense, sparse = [], []
+            if batch.items and not self.cancelled.is_set():
+                self._yield_to_interactive()
+                start = time.perf_counter()
+                try:
+                    dense, sparse = self.rag_system.vector_db.embed_documents([chunk.page_content for _, chunk, _ in batch.items])
+                    self.stats["chunks"] += len(batch.items)
+                except Exception as e:
+                    for doc_key in {doc_key for doc_key, _, _ in batch.items}:
+                        self._mark_failed(doc_key, e)
+                self.stats["embed_seconds"] += time.perf_counter() - start
+            embedded_queue.put((batch, dense, sparse))
+
+    def _upsert_stage(self, embedded_queue, progress_callback):
+        vector_db = self.rag_system.vector_db
+        collection_name = self.rag_system.collection_name
+
+        for batch, dense, sparse in self._drain(embedded_queue):
+            # Cancelled runs keep draining so the other stages can finish
+            if self.cancelled.is_set():
+                continue
+            self._yield_to_interactive()
+            start = time.perf_counter()
+            for plan in batch.opened:
+                try:
+                    vector_db.delete_by_source(collection_name, f"{plan.doc_key}.pdf")
+                except Exception as e:
+                    self._mark_failed(plan.doc_key, e)
+
+            live = [i for i, (doc_key, _, _) in enumerate(batch.items) if doc_key not in self.failed]
+            if live:
+                try:
+                    vector_db.upsert_embedded(
+                        collection_name,
+                        [batch.items[i][1] for i in live],
+                        [dense[i] for i in live],
+                        [sparse[i] for i in live],
+                        ids=[batch.items[i][2] for i in live],
+                    )
+                except Exception as e:
+                    for doc_key in {batch.items[i][0] for i in live}:
+                        self._mark_failed(doc_key, e)
+            self.stats["write_seconds"] += time.perf_counter() - start
+
+            for plan in batch.closed:
+                if plan.doc_key in self.failed:
+                    continue
+                try:
+                    self._finish_document(plan)
+                except Exception as e:
+                    self._mark_failed(plan.doc_key, e)
+                    continue
+                self._added += 1
+                self.indexed[plan.doc_key] = plan.snippets
+                if progress_callback:
+                    progress_callback(self._added / self._total, f"Indexed {plan.doc_key} ({self._added}/{self._total})")
+
+    def _finish_document(self, plan: DocumentPlan):
+        # Runs after every child of the document was upserted; the manifest is written last, so a
+        # document whose parents or points are only partly written is redone on the next run
+        self.rag_system.parent_store.save_many(plan.changed_parents)
+        plan.changed_parents = []
+        self.rag_system.vector_db.delete_points(self.rag_system.collection_name, plan.stale_child_ids)
+        self.rag_system.parent_store.delete_many(plan.stale_parent_ids)
+        self.manifest.record(plan.doc_key, plan.source_hash, plan.md_hash, plan.parent_hashes, plan.child_ids)
@@ -0,0 +1,42 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class InteractiveGate:
+    """Lets background work step aside while interactive requests are in flight.
+
+    Chat turns run inside ``interactive()``; background ingestion calls
+    ``wait_idle()`` before each embedding batch, Qdrant write and catalog
+    suggestion call, so it only uses the embedding model, the Qdrant client
+    and the LLM between turns. The wait is
+    capped so a continuous stream of chat traffic slows ingestion down
+    without stopping it.
+    """
+
+    def __init__(self):
+        self._active = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def interactive(self):
+        with self._condition:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                if self._active == 0:
+                    self._condition.notify_all()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def wait_idle(self, timeout: float) -> float:
+        """Block until no interactive request is in flight, or ``timeout`` seconds; returns the time waited."""
+        start = time.monotonic()
+        with self._condition:
+            self._condition.wait_for(lambda: self._active == 0, timeout)
+        return time.monotonic() - start
@@ -1,11 +1,19 @@
-import uuid
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_ollama import ChatOllama
 import config
 from db.vector_db_manager import VectorDbManager
 from db.parent_store_manager import ParentStoreManager
+from db.index_manifest import IndexManifest
+from db.document_catalog import DocumentCatalog
 from document_chunker import DocumentChuncker
 from rag_agent.tools import ToolFactory
 from rag_agent.graph import create_agent_graph
+from rag_agent.nodes import summarize_turn
+from rag_agent.checkpointing import CheckpointStore
+from rag_agent.answer_cache import SemanticAnswerCache
+from rag_agent.retrieval_cache import RetrievalCache
+from rag_agent.conversational_router import ConversationalRouter
+from core.interactive_gate import InteractiveGate
 
 class RAGSystem:
     
@@ -13,24 +21,63 @@ class RAGSystem:
         self.collection_name = collection_name
         self.vector_db = VectorDbManager()
         self.parent_store = ParentStoreManager()
+        self.index_manifest = IndexManifest()
+        self.document_catalog = DocumentCatalog()
         self.chunker = DocumentChuncker()
+        self.checkpoints = CheckpointStore()
+        self.retrieval_cache = RetrievalCache() if config.RETRIEVAL_CACHE_ENABLED else None
+        self.answer_cache = SemanticAnswerCache(self.vector_db.embed_query) if config.ANSWER_CACHE_ENABLED else None
+        self.router = ConversationalRouter(self.vector_db.embed_query) if config.CONVERSATIONAL_ROUTER_ENABLED else None
+        # Chat turns hold it so background ingestion waits for them
+        self.interactive_gate = InteractiveGate()
+        self.llm = None
         self.agent_graph = None
-        self.thread_id = str(uuid.uuid4())
         
-    def initialize(self, get_document_sources=None):
+    def initialize(self):
         self.vector_db.create_collection(self.collection_name)
         collection = self.vector_db.get_collection(self.collection_name)
 
-        llm = ChatOllama(model=config.LLM_MODEL, temperature=config.LLM_TEMPERATURE)
-        tools = ToolFactory(collection).create_tools()
-        self.agent_graph = create_agent_graph(llm, tools, collection=collection, get_document_sources=get_document_sources)
+        self.llm = ChatOllama(model=config.LLM_MODEL, temperature=config.LLM_TEMPERATURE)
+        self.build_agent_graph(collection)
+        self.checkpoints.start_compaction()
+
+    def build_agent_graph(self, collection=None):
+        """(Re)compile the agent graph, e.g. after changing RETRIEVAL_MODE; requires ``initialize``."""
+        if collection is None:
+            collection = self.vector_db.get_collection(self.collection_name)
+        tools = ToolFactory(collection, self.parent_store, self.retrieval_cache, self.vector_db.search_params()).create_tools()
+        self.agent_graph = create_agent_graph(self.llm, tools, self.checkpoints.saver, catalog=self.document_catalog,
+                                              answer_cache=self.answer_cache, router=self.router)
         
-    def get_config(self):
-        return {"configurable": {"thread_id": self.thread_id}}
+    def get_config(self, thread_id):
+        return {"configurable": {"thread_id": thread_id}}
     
-    def reset_thread(self):
-        try:
-            self.agent_graph.checkpointer.delete_thread(self.thread_id)
-        except Exception as e:
-            print(f"Warning: Could not delete thread {self.thread_id}: {e}")
-        self.thread_id = str(uuid.uuid4())
\ No newline at end of file
+    async def summarize_turn(self, thread_id, user_message):
+        """Fold the thread's latest turn into its stored conversation summary."""
+        run_config = self.get_config(thread_id)
+        state = await self.agent_graph.aget_state(run_config)
+        messages = state.values.get("messages", [])
+        # Rewritten RAG turns drop the user's message from the state, so it is passed in
+        if not messages or not isinstance(messages[-1], AIMessage):
+            return
+        summary = await summarize_turn(
+            self.llm, state.values.get("conversation_summary", ""),
+            [HumanMessage(content=user_message), messages[-1]], config.SUMMARY_WINDOW_TOKENS,
+        )
+        # Writing as the node that ended the turn keeps a pending clarification interrupt in place
+        as_node = "analyze_rewrite" if state.next else "aggregate"
+        await self.agent_graph.aupdate_state(run_config, {"conversation_summary": summary}, as_node=as_node)
+
+    def bump_corpus_version(self):
+        """Call whenever the indexed documents change so no cached retrieval or answer is served stale."""
+        if self.retrieval_cache is not None:
+            self.retrieval_cache.bump_version()
+        if self.answer_cache is not None:
+            self.answer_cache.bump_version()
+
+    def invalidate_answers(self):
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
+
+    def delete_thread(self, thread_id):
+        self.checkpoints.delete_thread(thread_id)
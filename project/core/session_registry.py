@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import psutil
+import config
+
+@dataclass
+class Session:
+    session_id: str
+    thread_id: str
+    last_seen: float = field(default_factory=time.monotonic)
+    # Serializes turns of one session so a double submit can't interleave on the same thread
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SessionRegistry:
+    """Maps Gradio session IDs to their own LangGraph thread.
+
+    Sessions idle for longer than ``ttl_seconds`` expire and the least recently
+    used session is evicted beyond ``max_sessions``. ``on_evict`` is called with
+    the thread ID of every dropped session so its checkpoints can be deleted.
+    With the in-memory checkpointer, where conversations live in the process,
+    the oldest tenth of sessions is also evicted whenever the process RSS
+    exceeds ``memory_limit_mb``. A session with a turn in flight is never
+    evicted.
+
+    With a ``store`` (the ``CheckpointStore``) the session -> thread mapping is
+    persisted on every use, so a session seen again after a restart continues
+    its thread unless it has been idle for longer than ``ttl_seconds``.
+    """
+
+    def __init__(self, on_evict, store=None, ttl_seconds=config.SESSION_TTL_SECONDS, max_sessions=config.MAX_SESSIONS,
+                 memory_limit_mb=config.SESSION_MEMORY_LIMIT_MB):
+        self.on_evict = on_evict
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        # Evicting sessions only frees memory when their checkpoints are held in RAM
+        in_memory = store is None or store.backend == "memory"
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb and in_memory else None
+        self.__sessions = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__process = psutil.Process()
+
+    def __len__(self):
+        return len(self.__sessions)
+
+    def get(self, session_id: str) -> Session:
+        """Blocking when a store is set: call it off the event loop."""
+        with self.__lock:
+            session = self.__sessions.get(session_id)
+            if session is None:
+                session = Session(session_id=session_id, thread_id=self.__restore_thread(session_id))
+                evicted, pressured = self.__collect_evictions()
+                self.__sessions[session_id] = session
+            else:
+                self.__sessions.move_to_end(session_id)
+                evicted, pressured = [], []
+            session.last_seen = time.monotonic()
+        # Written before the turn's first checkpoint, so compaction never sees the thread as unreferenced
+        self.__save(session)
+        self.__forget(evicted)
+        self.__evict([s.thread_id for s in pressured])
+        return session
+
+    def reset(self, session_id: str) -> None:
+        """Give the session a fresh thread, dropping the old thread's checkpoints."""
+        with self.__lock:
+            session = self.__sessions.get(session_id)
+            if session is None:
+                return
+            old_thread_id, session.thread_id = session.thread_id, str(uuid.uuid4())
+        self.__save(session)
+        self.__evict([old_thread_id])
+
+    def remove(self, session_id: str) -> None:
+        with self.__lock:
+            session = self.__sessions.pop(session_id, None)
+        if session:
+            self.__forget([session])
+
+    def __restore_thread(self, session_id: str) -> str:
+        stored = self.store.load_session(session_id) if self.store else None
+        if stored is None:
+            return str(uuid.uuid4())
+        thread_id, last_seen = stored
+        if time.time() - last_seen > self.ttl_seconds:
+            # Expired while the app was down; compaction deletes the old thread
+            return str(uuid.uuid4())
+        return thread_id
+
+    def __save(self, session: Session):
+        if self.store is None:
+            return
+        try:
+            self.store.save_session(session.session_id, session.thread_id)
+        except Exception as e:
+            print(f"Warning: Could not save session {session.session_id}: {e}")
+
+    def __collect_evictions(self):
+        """Returns (expired or over the limit, evicted for memory); runs before a new session is added."""
+        # Sessions are ordered by last use, so expired ones are at the front
+        idle = [session for session in self.__sessions.values() if not session.lock.locked()]
+        evicted, pressured = [], []
+        now = time.monotonic()
+        for session in idle:
+            if now - session.last_seen <= self.ttl_seconds and len(self.__sessions) < self.max_sessions:
+                break
+            evicted.append(self.__sessions.pop(session.session_id))
+
+        if self.memory_limit_bytes and self.__process.memory_info().rss > self.memory_limit_bytes:
+            for session in idle[len(evicted):len(evicted) + max(1, len(self.__sessions) // 10)]:
+                pressured.append(self.__sessions.pop(session.session_id))
+        return evicted, pressured
+
+    def __forget(self, sessions):
+        for session in sessions:
+            if self.store is not None:
+                try:
+                    self.store.delete_session(session.session_id)
+                except Exception as e:
+                    print(f"Warning: Could not delete session {session.session_id}: {e}")
+        self.__evict([session.thread_id for session in sessions])
+
+    def __evict(self, thread_ids):
+        for thread_id in thread_ids:
+            try:
+                self.on_evict(thread_id)
+            except Exception as e:
+                print(f"Warning: Could not delete thread {thread_id}: {e}")
@@ -0,0 +1,123 @@
+import json
+import re
+import sqlite3
+import threading
+from typing import List
+import config
+
+def select_snippets(child_chunks, count=config.CATALOG_SNIPPETS_PER_DOC, max_chars=200) -> List[str]:
+    """Pick ``count`` child chunks spread evenly over the document as its content snippets."""
+    if not child_chunks:
+        return []
+    step = max(1, len(child_chunks) // count)
+    return [chunk.page_content[:max_chars].strip() for chunk in child_chunks[::step][:count]]
+
+def parse_questions(text: str) -> List[str]:
+    """Split an LLM-generated numbered or bulleted list into questions."""
+    questions = []
+    for line in text.splitlines():
+        line = re.sub(r"^\s*(?:\d+[.)]|[-*•])\s*", "", line).strip()
+        if line:
+            questions.append(line)
+    return questions
+
+
+class DocumentCatalog:
+    """Per-document content snippets and suggested questions, built at ingestion time.
+
+    Entries are persisted in SQLite and mirrored in memory. The text the chat
+    nodes need (source list, formatted snippets, suggested questions) is
+    rebuilt on the first read after a change, so cataloging many documents
+    costs one rebuild rather than one per document, and reading it costs
+    nothing per request.
+    """
+
+    def __init__(self, path=config.DOCUMENT_CATALOG_PATH, max_suggestions=config.CATALOG_MAX_SUGGESTIONS):
+        self.max_suggestions = max_suggestions
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        self.__lock = threading.Lock()
+        with self.__conn:
+            self.__conn.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    doc TEXT PRIMARY KEY,
+                    snippets TEXT NOT NULL,
+                    suggestions TEXT NOT NULL
+                )
+            """)
+        self.__entries = {
+            doc: (json.loads(snippets), json.loads(suggestions))
+            for doc, snippets, suggestions in self.__conn.execute("SELECT doc, snippets, suggestions FROM documents")
+        }
+        self.__views = None
+
+    def __contains__(self, doc: str) -> bool:
+        return doc in self.__entries
+
+    def without_suggestions(self) -> List[tuple]:
+        """(doc, snippets) of every entry that has no suggested questions."""
+        with self.__lock:
+            return [(doc, snippets) for doc, (snippets, suggestions) in sorted(self.__entries.items()) if not suggestions]
+
+    def upsert(self, doc: str, snippets: List[str], suggestions: List[str]) -> None:
+        with self.__lock:
+            with self.__conn:
+                self.__conn.execute(
+                    "INSERT OR REPLACE INTO documents (doc, snippets, suggestions) VALUES (?, ?, ?)",
+                    (doc, json.dumps(snippets), json.dumps(suggestions))
+                )
+            self.__entries[doc] = (snippets, suggestions)
+            self.__views = None
+
+    def remove(self, doc: str) -> None:
+        with self.__lock:
+            with self.__conn:
+                self.__conn.execute("DELETE FROM documents WHERE doc = ?", (doc,))
+            self.__entries.pop(doc, None)
+            self.__views = None
+
+    def clear(self) -> None:
+        with self.__lock:
+            with self.__conn:
+                self.__conn.execute("DELETE FROM documents")
+            self.__entries.clear()
+            self.__views = None
+
+    def __rebuild_views(self) -> None:
+        docs = sorted(self.__entries)
+        sources = [f"{doc}.pdf" for doc in docs]
+        snippets = "\n".join(
+            f"- [{source}] {snippet}"
+            for doc, source in zip(docs, sources)
+            for snippet in self.__entries[doc][0]
+        )
+
+        # Round-robin over documents so the suggestions cover as many of them as possible
+        picked, round_index = [], 0
+        while len(picked) < self.max_suggestions:
+            row = [self.__entries[doc][1][round_index] for doc in docs if round_index < len(self.__entries[doc][1])]
+            if not row:
+                break
+            picked.extend(row[:self.max_suggestions - len(picked)])
+            round_index += 1
+        suggestions = "\n".join(f"{i}. {question}" for i, question in enumerate(picked, start=1))
+
+        # Swapped in as one tuple so readers never see a partially rebuilt view
+        self.__views = (sources, snippets or None, suggestions or None)
+
+    def __current_views(self):
+        views = self.__views
+        if views is None:
+            with self.__lock:
+                if self.__views is None:
+                    self.__rebuild_views()
+                views = self.__views
+        return views
+
+    def sources(self) -> List[str]:
+        return self.__current_views()[0]
+
+    def snippets_text(self):
+        return self.__current_views()[1]
+
+    def suggestions_text(self):
+        return self.__current_views()[2]
@@ -0,0 +1,152 @@
+import hashlib
+import sqlite3
+import struct
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List
+import config
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant import SparseEmbeddings, SparseVector
+
+class EmbeddingCache:
+    """Content-addressed on-disk store of embeddings, bounded by total size.
+
+    Entries are keyed by sha256(model name + chunk text), so an unchanged chunk is
+    never embedded twice by the same model, regardless of which document it came
+    from or whether the collection was dropped in between. When the stored
+    vectors exceed ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, path=config.EMBEDDING_CACHE_PATH, max_bytes=config.EMBEDDING_CACHE_MAX_MB * 1024 * 1024):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        self.__conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used INTEGER NOT NULL
+            )
+        """)
+        self.__conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self.__lock = threading.Lock()
+        self.__max_bytes = max_bytes
+        self.__total_bytes = self.__conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        found = {}
+        now = time.time_ns()
+        with self.__lock, self.__conn:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                found.update(self.__conn.execute(
+                    f"SELECT key, value FROM embeddings WHERE key IN ({placeholders})", part
+                ).fetchall())
+            self.__conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, k) for k in found])
+        return found
+
+    def put_many(self, items: Dict[str, bytes]) -> None:
+        if not items:
+            return
+        now = time.time_ns()
+        with self.__lock, self.__conn:
+            for k, v in items.items():
+                # Keys another writer stored first are ignored and must not count towards the total
+                if self.__conn.execute(
+                    "INSERT OR IGNORE INTO embeddings (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (k, v, len(v), now)
+                ).rowcount:
+                    self.__total_bytes += len(v)
+            if self.__total_bytes > self.__max_bytes:
+                self.__evict()
+
+    def __evict(self, chunk_size=1000) -> None:
+        # Trim to 90% of the budget so eviction doesn't run on every insert
+        target = int(self.__max_bytes * 0.9)
+        evicted = 0
+        while self.__total_bytes > target:
+            # Oldest entries first, in chunks, stopping at the first one that brings the total under the target
+            sizes = self.__conn.execute("""
+                DELETE FROM embeddings WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, size, SUM(size) OVER (ORDER BY last_used ROWS UNBOUNDED PRECEDING) AS freed
+                        FROM (SELECT key, size, last_used FROM embeddings ORDER BY last_used LIMIT ?)
+                    ) WHERE freed - size < ?
+                ) RETURNING size
+            """, (chunk_size, self.__total_bytes - target)).fetchall()
+            if not sizes:
+                self.__total_bytes = 0
+                break
+            evicted += len(sizes)
+            self.__total_bytes -= sum(size for (size,) in sizes)
+        print(f"Embedding cache: evicted {evicted} entries")
+
+
+class CachedDenseEmbeddings(Embeddings):
+    """Dense embeddings that only run the wrapped model on cache misses."""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model_name: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [EmbeddingCache.make_key(self.model_name, t) for t in texts]
+        cached = self.cache.get_many(list(set(keys)))
+        misses = {k: t for k, t in zip(keys, texts) if k not in cached}
+
+        if misses:
+            vectors = self.embeddings.embed_documents(list(misses.values()))
+            computed = {k: array("f", v).tobytes() for k, v in zip(misses, vectors)}
+            self.cache.put_many(computed)
+            cached.update(computed)
+
+        return [array("f", cached[k]).tolist() for k in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+
+class CachedSparseEmbeddings(SparseEmbeddings):
+    """Sparse embeddings that only run the wrapped model on cache misses."""
+
+    def __init__(self, embeddings: SparseEmbeddings, cache: EmbeddingCache, model_name: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+
+    @staticmethod
+    def _encode(vector: SparseVector) -> bytes:
+        return struct.pack("<I", len(vector.indices)) + array("I", vector.indices).tobytes() + array("f", vector.values).tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> SparseVector:
+        (n,) = struct.unpack_from("<I", blob)
+        indices = array("I", blob[4:4 + 4 * n])
+        values = array("f", blob[4 + 4 * n:])
+        return SparseVector(indices=indices.tolist(), values=values.tolist())
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        keys = [EmbeddingCache.make_key(self.model_name, t) for t in texts]
+        cached = self.cache.get_many(list(set(keys)))
+        misses = {k: t for k, t in zip(keys, texts) if k not in cached}
+
+        if misses:
+            vectors = self.embeddings.embed_documents(list(misses.values()))
+            computed = {k: self._encode(v) for k, v in zip(misses, vectors)}
+            self.cache.put_many(computed)
+            cached.update(computed)
+
+        return [self._decode(cached[k]) for k in keys]
+
+    def embed_query(self, text: str) -> SparseVector:
+        return self.embeddings.embed_query(text)
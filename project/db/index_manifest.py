@@ -0,0 +1,104 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import uuid
+from typing import Dict, List, Optional
+import config
+
+_POINT_NAMESPACE = uuid.UUID("5b0c7f0e-3f1c-4b8e-9a51-6f3d2a1c9e47")
+
+def content_hash(text: str, metadata: Optional[Dict] = None) -> str:
+    payload = text if metadata is None else text + "\0" + json.dumps(metadata, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+def child_point_ids(doc_key: str, child_chunks: List) -> List[str]:
+    """Deterministic Qdrant point IDs derived from each child's text and metadata.
+
+    Identical chunks within a document are disambiguated by their occurrence
+    count, so re-chunking unchanged content always yields the same IDs.
+    """
+    seen, ids = {}, []
+    for chunk in child_chunks:
+        chunk_hash = content_hash(chunk.page_content, chunk.metadata)
+        occurrence = seen.get(chunk_hash, 0)
+        seen[chunk_hash] = occurrence + 1
+        ids.append(str(uuid.uuid5(_POINT_NAMESPACE, f"{doc_key}\0{chunk_hash}\0{occurrence}")))
+    return ids
+
+
+class IndexManifest:
+    """Record of what is currently indexed for each markdown document.
+
+    Stores the hash of the uploaded source file and of its markdown, the content
+    hash of every parent chunk and the point ID of every child chunk, so a
+    re-ingested document can be diffed against the index instead of rebuilt.
+    """
+
+    def __init__(self, path=config.INDEX_MANIFEST_PATH):
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        self.__lock = threading.Lock()
+        with self.__conn:
+            self.__conn.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    doc TEXT PRIMARY KEY,
+                    source_hash TEXT NOT NULL,
+                    md_hash TEXT NOT NULL
+                )
+            """)
+            self.__conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    doc TEXT NOT NULL,
+                    kind TEXT NOT NULL CHECK(kind IN ('parent', 'child')),
+                    chunk_id TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (doc, kind, chunk_id)
+                )
+            """)
+
+    def get_document(self, doc: str) -> Optional[Dict]:
+        with self.__lock:
+            row = self.__conn.execute(
+                "SELECT source_hash, md_hash FROM documents WHERE doc = ?", (doc,)
+            ).fetchone()
+        return {"source_hash": row[0], "md_hash": row[1]} if row else None
+
+    def get_chunks(self, doc: str, kind: str) -> Dict[str, str]:
+        with self.__lock:
+            return dict(self.__conn.execute(
+                "SELECT chunk_id, hash FROM chunks WHERE doc = ? AND kind = ?", (doc, kind)
+            ).fetchall())
+
+    def documents(self) -> List[str]:
+        with self.__lock:
+            return [row[0] for row in self.__conn.execute("SELECT doc FROM documents ORDER BY doc")]
+
+    def record(self, doc: str, source_hash: str, md_hash: str, parent_hashes: Dict[str, str], child_ids: List[str]) -> None:
+        with self.__lock, self.__conn:
+            self.__conn.execute(
+                "INSERT OR REPLACE INTO documents (doc, source_hash, md_hash) VALUES (?, ?, ?)",
+                (doc, source_hash, md_hash)
+            )
+            self.__conn.execute("DELETE FROM chunks WHERE doc = ?", (doc,))
+            self.__conn.executemany(
+                "INSERT OR IGNORE INTO chunks (doc, kind, chunk_id, hash) VALUES (?, ?, ?, ?)",
+                [(doc, "parent", pid, h) for pid, h in parent_hashes.items()]
+                + [(doc, "child", cid, cid) for cid in child_ids]
+            )
+
+    def remove(self, doc: str) -> None:
+        with self.__lock, self.__conn:
+            self.__conn.execute("DELETE FROM documents WHERE doc = ?", (doc,))
+            self.__conn.execute("DELETE FROM chunks WHERE doc = ?", (doc,))
+
+    def clear(self) -> None:
+        with self.__lock, self.__conn:
+            self.__conn.execute("DELETE FROM documents")
+            self.__conn.execute("DELETE FROM chunks")
@@ -1,34 +1,168 @@
 import re
 import json
 import shutil
+import sqlite3
+import threading
 import config
+from cache import LRUCache
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterator, Tuple
+
+class JsonParentStore:
+    """One pretty-printed JSON file per parent chunk."""
+    __store_path: Path
+
+    def __init__(self, store_path):
+        self.__store_path = Path(store_path)
+        self.__store_path.mkdir(parents=True, exist_ok=True)
+
+    def __file(self, parent_id: str) -> Path:
+        return self.__store_path / (parent_id if parent_id.lower().endswith(".json") else f"{parent_id}.json")
+
+    def save_many(self, records: List[Tuple[str, str, Dict]]) -> None:
+        for parent_id, content, metadata in records:
+            self.__file(parent_id).write_text(
+                json.dumps({"page_content": content, "metadata": metadata}, ensure_ascii=False, indent=2),
+                encoding="utf-8"
+            )
+
+    def load_many(self, parent_ids: List[str]) -> Dict[str, Dict]:
+        return {pid: json.loads(self.__file(pid).read_text(encoding="utf-8")) for pid in parent_ids}
+
+    def delete_many(self, parent_ids: List[str]) -> None:
+        for parent_id in parent_ids:
+            self.__file(parent_id).unlink(missing_ok=True)
+
+    def iter_all(self) -> Iterator[Tuple[str, Dict]]:
+        for file_path in sorted(self.__store_path.glob("*.json")):
+            yield file_path.stem, json.loads(file_path.read_text(encoding="utf-8"))
+
+    def clear(self) -> None:
+        if self.__store_path.exists():
+            shutil.rmtree(self.__store_path)
+        self.__store_path.mkdir(parents=True, exist_ok=True)
+
+
+class SqliteParentStore:
+    """All parent chunks in a single SQLite file; bulk writes and batch reads each take one statement."""
+    __conn: sqlite3.Connection
+
+    def __init__(self, store_path):
+        Path(store_path).mkdir(parents=True, exist_ok=True)
+        self.__conn = sqlite3.connect(Path(store_path) / "parents.db", check_same_thread=False)
+        self.__lock = threading.Lock()
+        with self.__conn:
+            self.__conn.execute("PRAGMA journal_mode=WAL")
+            self.__conn.execute("""
+                CREATE TABLE IF NOT EXISTS parents (
+                    parent_id TEXT PRIMARY KEY,
+                    page_content TEXT NOT NULL,
+                    metadata TEXT NOT NULL
+                )
+            """)
+
+    def save_many(self, records: List[Tuple[str, str, Dict]]) -> None:
+        with self.__lock, self.__conn:
+            self.__conn.executemany(
+                "INSERT OR REPLACE INTO parents (parent_id, page_content, metadata) VALUES (?, ?, ?)",
+                [(pid, content, json.dumps(metadata, ensure_ascii=False)) for pid, content, metadata in records]
+            )
+
+    def load_many(self, parent_ids: List[str]) -> Dict[str, Dict]:
+        found = {}
+        with self.__lock:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(parent_ids), 500):
+                part = parent_ids[i:i + 500]
+                rows = self.__conn.execute(
+                    f"SELECT parent_id, page_content, metadata FROM parents WHERE parent_id IN ({','.join('?' * len(part))})",
+                    part
+                ).fetchall()
+                found.update({pid: {"page_content": content, "metadata": json.loads(metadata)} for pid, content, metadata in rows})
+        return found
+
+    def delete_many(self, parent_ids: List[str]) -> None:
+        with self.__lock, self.__conn:
+            self.__conn.executemany("DELETE FROM parents WHERE parent_id = ?", [(pid,) for pid in parent_ids])
+
+    def clear(self) -> None:
+        with self.__lock, self.__conn:
+            self.__conn.execute("DELETE FROM parents")
+
+
+PARENT_STORE_BACKENDS = {
+    "json": JsonParentStore,
+    "sqlite": SqliteParentStore,
+}
+
 
 class ParentStoreManager:
     __store_path: Path
 
-    def __init__(self, store_path=config.PARENT_STORE_PATH):
-        self.__store_path = Path(store_path) 
+    def __init__(self, store_path=config.PARENT_STORE_PATH, backend=config.PARENT_STORE_BACKEND):
+        self.__store_path = Path(store_path)
         self.__store_path.mkdir(parents=True, exist_ok=True)
+        self.__backend = PARENT_STORE_BACKENDS[backend](self.__store_path)
+        # Hot parents are served from memory; bounded by the approximate size of their text
+        self.__cache = LRUCache(max_bytes=config.PARENT_CACHE_MAX_MB * 1024 * 1024, sizeof=self._entry_size)
+
+        if backend != "json" and any(self.__store_path.glob("*.json")):
+            self.migrate_from_json(self.__store_path)
+
+    def migrate_from_json(self, json_dir, batch_size: int = 1000) -> int:
+        """Copy parent chunks from a legacy JSON directory into the active backend, then remove the JSON files."""
+        source = JsonParentStore(json_dir)
+        batch, migrated = [], 0
+
+        for parent_id, data in source.iter_all():
+            batch.append((parent_id, data["page_content"], data["metadata"]))
+            if len(batch) >= batch_size:
+                self.__backend.save_many(batch)
+                migrated += len(batch)
+                batch = []
+        if batch:
+            self.__backend.save_many(batch)
+            migrated += len(batch)
+
+        for file_path in Path(json_dir).glob("*.json"):
+            file_path.unlink()
+        print(f"✓ Migrated {migrated} parent chunks from {json_dir}")
+        return migrated
+
+    @staticmethod
+    def _entry_size(data: Dict) -> int:
+        return len(data["page_content"]) + len(str(data["metadata"]))
 
     def save(self, parent_id: str, content: str, metadata: Dict) -> None:
-        file_path = self.__store_path / f"{parent_id}.json"
-        file_path.write_text(
-            json.dumps({"page_content": content,"metadata": metadata}, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
-    
+        self.__backend.save_many([(parent_id, content, metadata)])
+        self.__cache.invalidate([parent_id])
+
     def save_many(self, parents: List) -> None:
-        for parent_id, doc in parents:
-            self.save(parent_id, doc.page_content, doc.metadata)
+        if parents:
+            self.__backend.save_many([(parent_id, doc.page_content, doc.metadata) for parent_id, doc in parents])
+            self.__cache.invalidate([parent_id for parent_id, _ in parents])
+
+    def __load_many(self, parent_ids: List[str]) -> Dict[str, Dict]:
+        found, missing = {}, []
+        for pid in parent_ids:
+            data = self.__cache.get(pid)
+            if data is None:
+                missing.append(pid)
+            else:
+                found[pid] = data
+        if missing:
+            loaded = self.__backend.load_many(missing)
+            for pid, data in loaded.items():
+                self.__cache.put(pid, data)
+            found.update(loaded)
+        return found
 
     def load(self, parent_id: str) -> Dict:
-        file_path = self.__store_path / (
-            parent_id if parent_id.lower().endswith(".json") else f"{parent_id}.json"
-        )
-        return json.loads(file_path.read_text(encoding="utf-8"))
-    
+        data = self.__load_many([parent_id])
+        if parent_id not in data:
+            raise KeyError(f"Parent chunk not found: {parent_id}")
+        return data[parent_id]
+
     def load_content(self, parent_id: str) -> Dict:
         data = self.load(parent_id)
         return {
@@ -43,10 +177,22 @@ class ParentStoreManager:
         return int(match.group(1)) if match else 0
 
     def load_content_many(self, parent_ids: List[str]) -> List[Dict]:
-        unique_ids = set(parent_ids)
-        return [self.load_content(pid) for pid in sorted(unique_ids, key=self._get_sort_key)]
-    
+        unique_ids = sorted(set(parent_ids), key=self._get_sort_key)
+        data = self.__load_many(unique_ids)
+        return [
+            {"content": data[pid]["page_content"], "parent_id": pid, "metadata": data[pid]["metadata"]}
+            for pid in unique_ids if pid in data
+        ]
+
+    def delete_many(self, parent_ids: List[str]) -> None:
+        if parent_ids:
+            self.__backend.delete_many(list(parent_ids))
+            self.__cache.invalidate(parent_ids)
+
     def clear_store(self) -> None:
-        if self.__store_path.exists():
-            shutil.rmtree(self.__store_path)
-        self.__store_path.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+        self.__backend.clear()
+        self.__cache.clear()
+
+    def cache_stats(self) -> Dict:
+        """Hit/miss/eviction counters and current size of the in-memory parent cache."""
+        return self.__cache.stats()
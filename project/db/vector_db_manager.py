@@ -1,28 +1,75 @@
+import uuid
 import config
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_qdrant import QdrantVectorStore, FastEmbedSparse, RetrievalMode
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant import QdrantVectorStore, FastEmbedSparse, RetrievalMode, SparseEmbeddings
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
+from db.embedding_cache import EmbeddingCache, CachedDenseEmbeddings, CachedSparseEmbeddings
+
+PAYLOAD_SCHEMAS = {
+    "keyword": qmodels.PayloadSchemaType.KEYWORD,
+    "integer": qmodels.PayloadSchemaType.INTEGER,
+    "text": qmodels.PayloadSchemaType.TEXT,
+}
+
+def create_profiled_collection(client, collection_name, vector_size, profile):
+    """Create a dense + sparse collection with the storage and index settings of a QDRANT_COLLECTION_PROFILES entry."""
+    hnsw = profile.get("hnsw")
+    quantization = profile.get("quantization")
+    on_disk = profile.get("on_disk", False)
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=qmodels.VectorParams(size=vector_size, distance=qmodels.Distance.COSINE, on_disk=on_disk),
+        sparse_vectors_config={config.SPARSE_VECTOR_NAME: qmodels.SparseVectorParams(index=qmodels.SparseIndexParams(on_disk=on_disk))},
+        hnsw_config=qmodels.HnswConfigDiff(**hnsw) if hnsw else None,
+        quantization_config=qmodels.ScalarQuantization(
+            scalar=qmodels.ScalarQuantizationConfig(type=qmodels.ScalarType.INT8, **quantization)
+        ) if quantization else None,
+    )
+    create_payload_indexes(client, collection_name, profile)
+
+def create_payload_indexes(client, collection_name, profile):
+    # Creating an index that already exists is a no-op on the server
+    for field_name, schema in profile.get("payload_indexes", {}).items():
+        client.create_payload_index(collection_name, field_name, PAYLOAD_SCHEMAS[schema], wait=True)
+
+def profile_search_params(profile):
+    """Query-time SearchParams of a profile, or None for Qdrant's defaults."""
+    search = profile.get("search")
+    if not search:
+        return None
+    quantization = None
+    if "rescore" in search or "oversampling" in search:
+        quantization = qmodels.QuantizationSearchParams(rescore=search.get("rescore"), oversampling=search.get("oversampling"))
+    return qmodels.SearchParams(hnsw_ef=search.get("hnsw_ef"), quantization=quantization)
 
 class VectorDbManager:
     __client: QdrantClient
-    __dense_embeddings: HuggingFaceEmbeddings
-    __sparse_embeddings: FastEmbedSparse
-    def __init__(self):
-        self.__client = QdrantClient(path=config.QDRANT_DB_PATH)
+    __dense_embeddings: Embeddings
+    __sparse_embeddings: SparseEmbeddings
+    def __init__(self, profile=config.QDRANT_COLLECTION_PROFILE):
+        self.__local = config.QDRANT_URL is None
+        self.__client = QdrantClient(path=config.QDRANT_DB_PATH) if self.__local else QdrantClient(url=config.QDRANT_URL)
+        self.__profile = config.QDRANT_COLLECTION_PROFILES[profile]
         self.__dense_embeddings = HuggingFaceEmbeddings(model_name=config.DENSE_MODEL)
         self.__sparse_embeddings = FastEmbedSparse(model_name=config.SPARSE_MODEL)
 
+        if config.EMBEDDING_CACHE_ENABLED:
+            cache = EmbeddingCache()
+            self.__dense_embeddings = CachedDenseEmbeddings(self.__dense_embeddings, cache, config.DENSE_MODEL)
+            self.__sparse_embeddings = CachedSparseEmbeddings(self.__sparse_embeddings, cache, config.SPARSE_MODEL)
+
     def create_collection(self, collection_name):
+        # Local storage searches exhaustively; it accepts but ignores the profile's index settings
+        profile = {k: v for k, v in self.__profile.items() if k != "payload_indexes"} if self.__local else self.__profile
         if not self.__client.collection_exists(collection_name):
-            print(f"Creating collection: {collection_name}...")
-            self.__client.create_collection(
-                collection_name=collection_name,
-                vectors_config=qmodels.VectorParams(size=len(self.__dense_embeddings.embed_query("test")), distance=qmodels.Distance.COSINE),
-                sparse_vectors_config={config.SPARSE_VECTOR_NAME: qmodels.SparseVectorParams()},
-            )
+            print(f"Creating collection: {collection_name} (profile {config.QDRANT_COLLECTION_PROFILE})...")
+            create_profiled_collection(self.__client, collection_name, len(self.__dense_embeddings.embed_query("test")), profile)
             print(f"✓ Collection created: {collection_name}")
         else:
+            # Collections created before payload indexes were configured get them here
+            create_payload_indexes(self.__client, collection_name, profile)
             print(f"✓ Collection already exists: {collection_name}")
 
     def delete_collection(self, collection_name):
@@ -44,4 +91,46 @@ class VectorDbManager:
                     sparse_vector_name=config.SPARSE_VECTOR_NAME
                 )
         except Exception as e:
-            print(f"Unable to get collection {collection_name}: {e}")
\ No newline at end of file
+            print(f"Unable to get collection {collection_name}: {e}")
+
+    def search_params(self):
+        return None if self.__local else profile_search_params(self.__profile)
+
+    def embed_query(self, text):
+        return self.__dense_embeddings.embed_query(text)
+
+    def embed_documents(self, texts):
+        """Embed a batch of texts with both models; returns (dense_vectors, sparse_vectors)."""
+        return self.__dense_embeddings.embed_documents(texts), self.__sparse_embeddings.embed_documents(texts)
+
+    def upsert_embedded(self, collection_name, documents, dense_vectors, sparse_vectors, ids=None):
+        """Write pre-embedded documents using the same payload layout as QdrantVectorStore."""
+        ids = ids or [uuid.uuid4().hex for _ in documents]
+        points = [
+            qmodels.PointStruct(
+                id=point_id,
+                vector={
+                    QdrantVectorStore.VECTOR_NAME: dense,
+                    config.SPARSE_VECTOR_NAME: qmodels.SparseVector(indices=sparse.indices, values=sparse.values),
+                },
+                payload={
+                    QdrantVectorStore.CONTENT_KEY: doc.page_content,
+                    QdrantVectorStore.METADATA_KEY: doc.metadata,
+                },
+            )
+            for point_id, doc, dense, sparse in zip(ids, documents, dense_vectors, sparse_vectors)
+        ]
+        self.__client.upsert(collection_name=collection_name, points=points, wait=True)
+
+    def delete_points(self, collection_name, ids):
+        if ids:
+            self.__client.delete(collection_name=collection_name, points_selector=qmodels.PointIdsList(points=list(ids)), wait=True)
+
+    def delete_by_source(self, collection_name, source):
+        self.__client.delete(
+            collection_name=collection_name,
+            points_selector=qmodels.FilterSelector(filter=qmodels.Filter(
+                must=[qmodels.FieldCondition(key="metadata.source", match=qmodels.MatchValue(value=source))]
+            )),
+            wait=True,
+        )
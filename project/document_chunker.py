@@ -1,9 +1,87 @@
 import os
 import glob
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import config
 from pathlib import Path
+from langchain_core.documents import Document
 from langchain_text_splitters import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
 
+_worker_chunker = None
+
+def _chunk_in_worker(md_path):
+    # One chunker per worker process, reused for every file it is given
+    global _worker_chunker
+    if _worker_chunker is None:
+        _worker_chunker = DocumentChuncker()
+    return _worker_chunker.create_chunks_single(md_path)
+
+class _ChunkBuffer:
+    """A parent chunk that other chunks are merged into, joined once at the end.
+
+    Text parts and per-key metadata values are collected in lists and only
+    joined (metadata chained with " -> ") by ``to_document``, so merging n
+    sections is linear instead of re-copying the growing strings on every
+    step. A chunk nothing was merged into is returned unchanged.
+    """
+    __slots__ = ("chunk", "parts", "metadata", "length")
+
+    def __init__(self, chunk):
+        self.chunk = chunk
+        self.parts = None
+        self.metadata = None
+        self.length = len(chunk.page_content)
+
+    def __open(self):
+        if self.parts is None:
+            self.parts = [self.chunk.page_content]
+            self.metadata = {k: [v] for k, v in self.chunk.metadata.items()}
+
+    def add(self, chunk):
+        self.__open()
+        self.parts.append(chunk.page_content)
+        self.length += 2 + len(chunk.page_content)
+        for k, v in chunk.metadata.items():
+            if k in self.metadata:
+                self.metadata[k].append(v)
+            else:
+                self.metadata[k] = [v]
+
+    def append(self, other):
+        if other.parts is None:
+            self.add(other.chunk)
+            return
+        self.__open()
+        self.parts.extend(other.parts)
+        self.length += 2 + other.length
+        for k, values in other.metadata.items():
+            if k in self.metadata:
+                self.metadata[k].extend(values)
+            else:
+                self.metadata[k] = values
+
+    def prepend(self, other):
+        self.__open()
+        other.__open()
+        self.parts[:0] = other.parts
+        self.length += 2 + other.length
+        for k, values in other.metadata.items():
+            if k in self.metadata:
+                self.metadata[k][:0] = values
+            else:
+                self.metadata[k] = values
+
+    def to_document(self):
+        if self.parts is None:
+            return self.chunk
+        return Document(
+            page_content="\n\n".join(self.parts),
+            metadata={k: values[0] if len(values) == 1 else " -> ".join(map(str, values)) for k, values in self.metadata.items()},
+        )
+
+
 class DocumentChuncker:
     def __init__(self):
         self.__parent_splitter = MarkdownHeaderTextSplitter(
@@ -16,18 +94,87 @@ class DocumentChuncker:
         )
         self.__min_parent_size = config.MIN_PARENT_SIZE
         self.__max_parent_size = config.MAX_PARENT_SIZE
+        self.__parent_size_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.__max_parent_size,
+            chunk_overlap=config.CHILD_CHUNK_OVERLAP
+        )
 
-    def create_chunks(self, path_dir=config.MARKDOWN_DIR):
+    def create_chunks(self, path_dir=config.MARKDOWN_DIR, workers=config.CHUNKING_WORKERS):
         all_parent_chunks, all_child_chunks = [], []
+        md_paths = sorted(glob.glob(os.path.join(path_dir, "*.md")))
 
-        for doc_path_str in sorted(glob.glob(os.path.join(path_dir, "*.md"))):
-            doc_path = Path(doc_path_str)
-            parent_chunks, child_chunks = self.create_chunks_single(doc_path)
-            all_parent_chunks.extend(parent_chunks)
-            all_child_chunks.extend(child_chunks)
+        for md_path, chunks, error in self.iter_file_chunks(md_paths, workers):
+            if error is not None:
+                raise error
+            all_parent_chunks.extend(chunks[0])
+            all_child_chunks.extend(chunks[1])
         
         return all_parent_chunks, all_child_chunks
 
+    def iter_file_chunks(self, md_paths, workers=config.CHUNKING_WORKERS):
+        """Chunk markdown files, yielding (md_path, (parent_chunks, child_chunks), error) in input order.
+
+        ``md_paths`` may be a lazy iterable; it is consumed as results are
+        needed. With ``workers`` > 1 files are chunked in a process pool with
+        at most ``workers * 2`` files in flight. ``error`` is None on success,
+        and a failing file does not stop the rest; files caught in a crashed
+        pool are retried one at a time in a fresh pool. Output is identical to
+        calling ``create_chunks_single`` on each file, including parent IDs.
+        """
+        if workers <= 1:
+            for md_path in md_paths:
+                try:
+                    yield md_path, self.create_chunks_single(md_path), None
+                except Exception as e:
+                    yield md_path, None, e
+            return
+        yield from self.__chunk_files_in_pool(md_paths, workers)
+
+    @staticmethod
+    def __chunk_files_in_pool(md_paths, workers):
+        pending_paths = iter(md_paths)
+        while True:
+            crashed = yield from DocumentChuncker.__chunk_in_pool(pending_paths, workers)
+            if not crashed:
+                return
+            # Files caught in a crashed pool are retried one at a time in a fresh single-worker pool
+            for md_path in crashed:
+                if (yield from DocumentChuncker.__chunk_in_pool(iter([md_path]), 1)):
+                    yield md_path, None, BrokenProcessPool(f"Chunking worker crashed on {md_path}")
+
+    @staticmethod
+    def __chunk_in_pool(pending_paths, workers):
+        # Results are yielded in submission order with at most workers * 2 files in flight. If the
+        # pool breaks, returns the paths not yielded yet, in order; the rest stay in pending_paths.
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            def submit(md_path):
+                try:
+                    in_flight.append((md_path, executor.submit(_chunk_in_worker, md_path)))
+                    return True
+                except BrokenProcessPool:
+                    return False
+
+            for md_path in pending_paths:
+                if not submit(md_path):
+                    return [path for path, _ in in_flight] + [md_path]
+                if len(in_flight) >= workers * 2:
+                    break
+            while in_flight:
+                md_path, future = in_flight[0]
+                try:
+                    result, error = future.result(), None
+                except BrokenProcessPool:
+                    return [path for path, _ in in_flight]
+                except Exception as e:
+                    result, error = None, e
+                in_flight.popleft()
+                yield md_path, result, error
+                next_path = next(pending_paths, None)
+                if next_path is not None and not submit(next_path):
+                    return [path for path, _ in in_flight] + [next_path]
+        return []
+
     def create_chunks_single(self, md_path):
         doc_path = Path(md_path)
         
@@ -46,33 +193,26 @@ class DocumentChuncker:
         if not chunks:
             return []
         
-        merged, current = [], None
+        # Only the last merged parent can still grow, earlier ones are joined right away
+        merged, last, current = [], None, None
         
         for chunk in chunks:
             if current is None:
-                current = chunk
+                current = _ChunkBuffer(chunk)
             else:
-                current.page_content += "\n\n" + chunk.page_content
-                for k, v in chunk.metadata.items():
-                    if k in current.metadata:
-                        current.metadata[k] = f"{current.metadata[k]} -> {v}"
-                    else:
-                        current.metadata[k] = v
-
-            if len(current.page_content) >= self.__min_parent_size:
-                merged.append(current)
-                current = None
+                current.add(chunk)
+
+            if current.length >= self.__min_parent_size:
+                if last is not None:
+                    merged.append(last.to_document())
+                last, current = current, None
         
         if current:
-            if merged:
-                merged[-1].page_content += "\n\n" + current.page_content
-                for k, v in current.metadata.items():
-                    if k in merged[-1].metadata:
-                        merged[-1].metadata[k] = f"{merged[-1].metadata[k]} -> {v}"
-                    else:
-                        merged[-1].metadata[k] = v
+            if last is not None:
+                last.append(current)
             else:
-                merged.append(current)
+                last = current
+        merged.append(last.to_document())
         
         return merged
 
@@ -83,39 +223,35 @@ class DocumentChuncker:
             if len(chunk.page_content) <= self.__max_parent_size:
                 split_chunks.append(chunk)
             else:
-                splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=self.__max_parent_size,
-                    chunk_overlap=config.CHILD_CHUNK_OVERLAP
-                )
-                sub_chunks = splitter.split_documents([chunk])
-                split_chunks.extend(sub_chunks)
+                split_chunks.extend(self.__parent_size_splitter.split_documents([chunk]))
         
         return split_chunks
 
     def __clean_small_chunks(self, chunks):
-        cleaned = []
+        cleaned, last = [], None
+        # Small chunks at the start are carried forward and prepended to the next chunk
+        carry = None
         
         for i, chunk in enumerate(chunks):
-            if len(chunk.page_content) < self.__min_parent_size:
-                if cleaned:
-                    cleaned[-1].page_content += "\n\n" + chunk.page_content
-                    for k, v in chunk.metadata.items():
-                        if k in cleaned[-1].metadata:
-                            cleaned[-1].metadata[k] = f"{cleaned[-1].metadata[k]} -> {v}"
-                        else:
-                            cleaned[-1].metadata[k] = v
-                elif i < len(chunks) - 1:
-                    chunks[i + 1].page_content = chunk.page_content + "\n\n" + chunks[i + 1].page_content
-                    for k, v in chunk.metadata.items():
-                        if k in chunks[i + 1].metadata:
-                            chunks[i + 1].metadata[k] = f"{v} -> {chunks[i + 1].metadata[k]}"
-                        else:
-                            chunks[i + 1].metadata[k] = v
-                else:
-                    cleaned.append(chunk)
-            else:
-                cleaned.append(chunk)
+            current = _ChunkBuffer(chunk)
+            if carry is not None:
+                current.prepend(carry)
+                carry = None
+
+            if current.length < self.__min_parent_size:
+                if last is not None:
+                    last.append(current)
+                    continue
+                if i < len(chunks) - 1:
+                    carry = current
+                    continue
+
+            if last is not None:
+                cleaned.append(last.to_document())
+            last = current
         
+        if last is not None:
+            cleaned.append(last.to_document())
         return cleaned
 
     def __create_child_chunks(self, all_parent_pairs, all_child_chunks, parent_chunks, doc_path):
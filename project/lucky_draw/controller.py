@@ -3,6 +3,8 @@ from .database import LuckyDrawDB
 from .receipt_processor import ReceiptProcessor
 from .validators import parse_user_details
 from .intent_detector import IntentDetector
+from .flow_store import FlowStateStore
+import config
 from . import prompts
 
 EXIT_CONFIRMATIONS = {"yes", "y", "yeah", "yep", "sure", "ok", "okay", "ya", "yup"}
@@ -10,72 +12,76 @@ EXIT_CONFIRMATIONS = {"yes", "y", "yeah", "yep", "sure", "ok", "okay", "ya", "yu
 
 class LuckyDrawController:
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, persist_flows: bool = config.LUCKY_DRAW_FLOW_PERSIST):
         self.db = LuckyDrawDB(db_path)
         self.processor = ReceiptProcessor(self.db)
-        self.state = FlowState()
+        self.flows = FlowStateStore(self.db if persist_flows else None)
         self.intent_detector = IntentDetector()
 
-    @property
-    def is_active(self) -> bool:
-        return self.state.step != LuckyDrawStep.INACTIVE
+    def is_active(self, session_id: str) -> bool:
+        return self.flows.is_active(session_id)
 
-    def handle(self, message: str) -> str | None:
+    def reset(self, session_id: str) -> None:
+        self.flows.remove(session_id)
+
+    def handle(self, message: str, session_id: str) -> str | None:
         text = message.strip()
 
-        if not self.is_active:
+        state = self.flows.get(session_id)
+        if state is None:
             if self.intent_detector.is_lucky_draw_intent(text):
-                self.state.step = LuckyDrawStep.AWAITING_RECEIPT
+                self.flows.save(session_id, FlowState(step=LuckyDrawStep.AWAITING_RECEIPT))
                 return prompts.WELCOME
             return None
 
-        step = self.state.step
-
-        if step == LuckyDrawStep.AWAITING_RECEIPT:
-            return self._handle_awaiting_receipt(text)
-        if step == LuckyDrawStep.AWAITING_DETAILS:
-            return self._handle_awaiting_details(text)
-        if step == LuckyDrawStep.CONFIRMING_EXIT:
-            return self._handle_confirming_exit(text)
-
-        return None
+        try:
+            step = state.step
+            if step == LuckyDrawStep.AWAITING_RECEIPT:
+                return self._handle_awaiting_receipt(state, text)
+            if step == LuckyDrawStep.AWAITING_DETAILS:
+                return self._handle_awaiting_details(state, text)
+            if step == LuckyDrawStep.CONFIRMING_EXIT:
+                return self._handle_confirming_exit(state, text)
+            return None
+        finally:
+            self.flows.save(session_id, state)
 
-    def _handle_awaiting_receipt(self, text: str) -> str:
+    def _handle_awaiting_receipt(self, state: FlowState, text: str) -> str:
         if text.lower() == "image":
             receipt = self.processor.process()
-            self.state.receipt = receipt
-            self.state.step = LuckyDrawStep.AWAITING_DETAILS
+            state.receipt = receipt
+            state.step = LuckyDrawStep.AWAITING_DETAILS
             return prompts.RECEIPT_PROCESSED.format(
                 receipt_no=receipt.receipt_no,
                 amount=receipt.amount,
                 confidence_level=receipt.confidence_level,
             )
 
-        self.state.previous_step = LuckyDrawStep.AWAITING_RECEIPT
-        self.state.step = LuckyDrawStep.CONFIRMING_EXIT
+        state.previous_step = LuckyDrawStep.AWAITING_RECEIPT
+        state.step = LuckyDrawStep.CONFIRMING_EXIT
         return prompts.CONFIRM_EXIT
 
-    def _handle_awaiting_details(self, text: str) -> str:
+    def _handle_awaiting_details(self, state: FlowState, text: str) -> str:
         details, missing = parse_user_details(text)
 
         if details is None:
             if len(missing) == 3:
-                self.state.previous_step = LuckyDrawStep.AWAITING_DETAILS
-                self.state.step = LuckyDrawStep.CONFIRMING_EXIT
+                state.previous_step = LuckyDrawStep.AWAITING_DETAILS
+                state.step = LuckyDrawStep.CONFIRMING_EXIT
                 return prompts.CONFIRM_EXIT
 
-            self.state.retry_count += 1
-            if self.state.retry_count >= self.state.max_retries:
-                self.state.reset()
+            state.retry_count += 1
+            if state.retry_count >= state.max_retries:
+                state.reset()
                 return prompts.MAX_RETRIES_EXCEEDED
 
-            remaining = self.state.max_retries - self.state.retry_count
+            remaining = state.max_retries - state.retry_count
             return prompts.RETRY_DETAILS.format(remaining=remaining)
 
-        return self._process_entry(details)
+        return self._process_entry(state, details)
 
-    def _process_entry(self, details) -> str:
-        receipt = self.state.receipt
+    def _process_entry(self, state: FlowState, details) -> str:
+        receipt = state.receipt
 
         existing = self.db.find_approved_by_phone(details.phone_number)
         if existing:
@@ -88,7 +94,7 @@ class LuckyDrawController:
                 confidence_level=receipt.confidence_level,
                 status=EntryStatus.APPLIED,
             )
-            self.state.reset()
+            state.reset()
             return prompts.DUPLICATE.format(existing_receipt_no=existing["receipt_no"])
 
         if receipt.amount < 20:
@@ -101,7 +107,7 @@ class LuckyDrawController:
                 confidence_level=receipt.confidence_level,
                 status=EntryStatus.REJECTED,
             )
-            self.state.reset()
+            state.reset()
             return prompts.REJECTED_LOW_AMOUNT.format(amount=receipt.amount)
 
         if receipt.amount >= 20 and receipt.confidence_level >= 90:
@@ -118,7 +124,7 @@ class LuckyDrawController:
             confidence_level=receipt.confidence_level,
             status=status,
         )
-        self.state.reset()
+        state.reset()
 
         status_display = "Approved" if status == EntryStatus.APPROVED else "Pending Review"
         return prompts.SUCCESS.format(
@@ -126,19 +132,19 @@ class LuckyDrawController:
             status=status_display,
         )
 
-    def _handle_confirming_exit(self, text: str) -> str:
+    def _handle_confirming_exit(self, state: FlowState, text: str) -> str:
         if text.lower().strip() in EXIT_CONFIRMATIONS:
-            self.state.reset()
+            state.reset()
             return prompts.EXIT_CONFIRMED
 
-        previous = self.state.previous_step
-        self.state.step = previous
-        self.state.previous_step = None
+        previous = state.previous_step
+        state.step = previous
+        state.previous_step = None
 
         if previous == LuckyDrawStep.AWAITING_RECEIPT:
             return prompts.AWAITING_RECEIPT_REMINDER
         if previous == LuckyDrawStep.AWAITING_DETAILS:
             return prompts.AWAITING_DETAILS_REMINDER
 
-        self.state.reset()
+        state.reset()
         return prompts.EXIT_CONFIRMED
@@ -1,19 +1,74 @@
+import queue
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Optional
+import config
 from .models import EntryStatus
 
 
+class ConnectionPool:
+    """Fixed-size pool of long-lived SQLite connections shared across threads.
+
+    Connections are opened lazily in WAL mode, so readers never block the
+    writer, and with ``synchronous=NORMAL``, which is durable in WAL mode
+    except against power loss. ``connection()`` checks one out and runs the
+    block in a transaction that commits on success and rolls back on error.
+    """
+
+    def __init__(self, db_path: str, size: int = config.LUCKY_DRAW_DB_POOL_SIZE):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue()
+        self._slots = queue.Queue()
+        self._all = []
+        for _ in range(size):
+            self._slots.put(None)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-16000")
+        self._all.append(conn)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        self._slots.get()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+            try:
+                with conn:
+                    yield conn
+            finally:
+                self._idle.put(conn)
+        finally:
+            self._slots.put(None)
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+        self._all.clear()
+
+
 class LuckyDrawDB:
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._pool = ConnectionPool(db_path)
         self._init_db()
 
-    def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def _get_conn(self):
+        return self._pool.connection()
+
+    def close(self):
+        self._pool.close()
 
     def _init_db(self):
         with self._get_conn() as conn:
@@ -31,6 +86,21 @@ class LuckyDrawDB:
                     approved_at TIMESTAMP
                 )
             """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sequences (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            # Keyset pagination for review (status/date) and the duplicate-phone rule
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_status_created ON lucky_draw_entries (status, created_at, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_created ON lucky_draw_entries (created_at, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_phone_status ON lucky_draw_entries (phone_number, status)")
+            # Databases created before the sequence existed continue after their highest receipt
+            conn.execute("""
+                INSERT OR IGNORE INTO sequences (name, value)
+                SELECT 'receipt_no', COALESCE(MAX(receipt_no), 0) FROM lucky_draw_entries
+            """)
 
     def find_approved_by_phone(self, phone_number: str) -> Optional[dict]:
         with self._get_conn() as conn:
@@ -71,3 +141,11 @@ class LuckyDrawDB:
                 "SELECT COALESCE(MAX(receipt_no), 0) as max_no FROM lucky_draw_entries"
             ).fetchone()
             return row["max_no"]
+
+    def allocate_receipt_no(self) -> int:
+        """Reserve the next receipt number; concurrent callers always get distinct numbers."""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "UPDATE sequences SET value = value + 1 WHERE name = 'receipt_no' RETURNING value"
+            ).fetchone()
+            return row["value"]
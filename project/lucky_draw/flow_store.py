@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+import config
+from .models import FlowState, LuckyDrawStep, ReceiptData
+
+
+class FlowStateStore:
+    """Lucky-draw flow state per chat session.
+
+    Only sessions that are inside the flow are stored, so ``is_active`` is a
+    single dict lookup and users who never start the lucky draw cost nothing.
+    Sessions idle for longer than ``ttl_seconds`` drop out of the flow. When a
+    ``LuckyDrawDB`` is given, states are also written to its ``flow_states``
+    table so multi-step entries survive restarts.
+    """
+
+    def __init__(self, db=None, ttl_seconds=config.LUCKY_DRAW_FLOW_TTL_SECONDS):
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self._states = OrderedDict()  # session_id -> (FlowState, last_seen), oldest first
+        self._lock = threading.Lock()
+        if db is not None:
+            self._init_table()
+            self._load()
+
+    def is_active(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def get(self, session_id: str) -> Optional[FlowState]:
+        # Lock-free miss: the common case of a session that never entered the flow
+        if session_id not in self._states:
+            return None
+        with self._lock:
+            entry = self._states.get(session_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] > self.ttl_seconds:
+                del self._states[session_id]
+                expired = True
+            else:
+                expired = False
+        if expired:
+            self._delete(session_id)
+            return None
+        return entry[0]
+
+    def save(self, session_id: str, state: FlowState) -> None:
+        if state.step == LuckyDrawStep.INACTIVE:
+            self.remove(session_id)
+            return
+        with self._lock:
+            self._states[session_id] = (state, time.monotonic())
+            self._states.move_to_end(session_id)
+            expired = self._collect_expired()
+        for expired_id in expired:
+            self._delete(expired_id)
+        self._persist(session_id, state)
+
+    def remove(self, session_id: str) -> None:
+        with self._lock:
+            found = self._states.pop(session_id, None) is not None
+        if found:
+            self._delete(session_id)
+
+    def __len__(self):
+        return len(self._states)
+
+    def _collect_expired(self):
+        # Entries are ordered by last save, so expired ones are at the front
+        expired, now = [], time.monotonic()
+        while self._states:
+            session_id, (_, last_seen) = next(iter(self._states.items()))
+            if now - last_seen <= self.ttl_seconds:
+                break
+            del self._states[session_id]
+            expired.append(session_id)
+        return expired
+
+    def _init_table(self):
+        with self.db._get_conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS flow_states (
+                    session_id TEXT PRIMARY KEY,
+                    step TEXT NOT NULL,
+                    previous_step TEXT,
+                    retry_count INTEGER NOT NULL,
+                    receipt_no INTEGER,
+                    amount REAL,
+                    confidence_level REAL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def _load(self):
+        now_wall, now = time.time(), time.monotonic()
+        with self.db._get_conn() as conn:
+            conn.execute("DELETE FROM flow_states WHERE updated_at < ?", (now_wall - self.ttl_seconds,))
+            rows = conn.execute("SELECT * FROM flow_states ORDER BY updated_at").fetchall()
+        for row in rows:
+            receipt = None
+            if row["receipt_no"] is not None:
+                receipt = ReceiptData(row["receipt_no"], row["amount"], row["confidence_level"])
+            state = FlowState(
+                step=LuckyDrawStep(row["step"]),
+                receipt=receipt,
+                previous_step=LuckyDrawStep(row["previous_step"]) if row["previous_step"] else None,
+                retry_count=row["retry_count"],
+            )
+            # Keep the remaining idle time of restored sessions
+            self._states[row["session_id"]] = (state, now - (now_wall - row["updated_at"]))
+
+    def _persist(self, session_id: str, state: FlowState):
+        if self.db is None:
+            return
+        receipt = state.receipt
+        with self.db._get_conn() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO flow_states
+                   (session_id, step, previous_step, retry_count, receipt_no, amount, confidence_level, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (session_id, state.step.value, state.previous_step.value if state.previous_step else None,
+                 state.retry_count, receipt.receipt_no if receipt else None, receipt.amount if receipt else None,
+                 receipt.confidence_level if receipt else None, time.time())
+            )
+
+    def _delete(self, session_id: str):
+        if self.db is None:
+            return
+        with self.db._get_conn() as conn:
+            conn.execute("DELETE FROM flow_states WHERE session_id = ?", (session_id,))
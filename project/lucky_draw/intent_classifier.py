@@ -0,0 +1,46 @@
+import math
+import re
+from collections import Counter
+from .intent_examples import LUCKY_DRAW_EXAMPLES, OTHER_EXAMPLES
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def normalize(text: str) -> str:
+    return " ".join(TOKEN_PATTERN.findall(text.lower()))
+
+
+def features(text: str) -> list[str]:
+    words = normalize(text).split()
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class IntentClassifier:
+    """Multinomial naive Bayes over word unigrams and bigrams.
+
+    Trained in-process from the labelled examples shipped with the package,
+    so a prediction is a handful of dictionary lookups. Features never seen in
+    training are ignored; a message made only of unknown words gets the prior
+    of 0.5, which callers treat as low confidence.
+    """
+
+    def __init__(self, positive=LUCKY_DRAW_EXAMPLES, negative=OTHER_EXAMPLES, alpha=1.0):
+        counts = {True: Counter(), False: Counter()}
+        for label, examples in ((True, positive), (False, negative)):
+            for example in examples:
+                counts[label].update(features(example))
+
+        vocabulary = set(counts[True]) | set(counts[False])
+        totals = {label: sum(c.values()) + alpha * len(vocabulary) for label, c in counts.items()}
+        # Log-likelihood ratio of each feature: log P(f | lucky draw) - log P(f | other)
+        self.weights = {
+            feature: math.log((counts[True][feature] + alpha) / totals[True])
+                     - math.log((counts[False][feature] + alpha) / totals[False])
+            for feature in vocabulary
+        }
+
+    def probability(self, text: str) -> float:
+        """Probability that the message is a lucky-draw entry intent."""
+        score = sum(self.weights.get(feature, 0.0) for feature in features(text))
+        score = max(-50.0, min(50.0, score))
+        return 1.0 / (1.0 + math.exp(-score))
@@ -1,7 +1,10 @@
 import re
+from typing import Optional
 from langchain_ollama import ChatOllama
 from langchain_core.messages import SystemMessage, HumanMessage
 import config
+from cache import LRUCache
+from .intent_classifier import IntentClassifier, normalize
 
 # Exact matches — no LLM needed
 EXACT_KEYWORDS = re.compile(
@@ -9,7 +12,7 @@ EXACT_KEYWORDS = re.compile(
     re.IGNORECASE,
 )
 
-# Soft signals — worth asking the LLM about
+# Soft signals — worth classifying
 SOFT_SIGNALS = re.compile(
     r"\bdraw\b|\benter\b|\bprize\b|\bwin\b|\bcontest\b|\bgiveaway\b|\bsweepstake",
     re.IGNORECASE,
@@ -24,8 +27,11 @@ CLASSIFICATION_PROMPT = (
 
 class IntentDetector:
 
-    def __init__(self):
+    def __init__(self, confidence=config.LUCKY_DRAW_INTENT_CONFIDENCE, cache_size=config.LUCKY_DRAW_INTENT_CACHE_SIZE):
         self._llm = None
+        self.confidence = confidence
+        self.classifier = IntentClassifier()
+        self.decisions = LRUCache(max_entries=cache_size)
 
     @property
     def llm(self):
@@ -43,9 +49,27 @@ class IntentDetector:
         if not SOFT_SIGNALS.search(text):
             return False
 
+        key = normalize(text)
+        decision = self.decisions.get(key)
+        if decision is None:
+            decision = self._classify(text)
+            if decision is None:
+                # The LLM failed; fall back to "no" for now but ask again next time
+                return False
+            self.decisions.put(key, decision)
+        return decision
+
+    def _classify(self, text: str) -> Optional[bool]:
+        # Local classifier first; the LLM only decides when it isn't confident either way
+        probability = self.classifier.probability(text)
+        if probability >= self.confidence:
+            return True
+        if probability <= 1 - self.confidence:
+            return False
         return self._classify_with_llm(text)
 
-    def _classify_with_llm(self, text: str) -> bool:
+    def _classify_with_llm(self, text: str) -> Optional[bool]:
+        """YES/NO from the LLM, or None when the call fails."""
         try:
             response = self.llm.invoke([
                 SystemMessage(content=CLASSIFICATION_PROMPT),
@@ -58,4 +82,4 @@ class IntentDetector:
                 answer = answer.split("</think>")[-1].strip()
             return answer.startswith("YES")
         except Exception:
-            return False
+            return None
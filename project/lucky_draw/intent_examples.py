@@ -0,0 +1,84 @@
+# Labelled messages the local intent classifier is trained on. They focus on messages
+# that hit SOFT_SIGNALS, since only those reach the classifier.
+
+LUCKY_DRAW_EXAMPLES = [
+    "I want to win the prize",
+    "how can I win a prize",
+    "can I enter the contest",
+    "I'd like to enter the giveaway",
+    "sign me up for the giveaway",
+    "how do I take part in the contest",
+    "I want to participate in the prize giveaway",
+    "where do I submit my receipt to win",
+    "I bought something, can I win something",
+    "how do I enter to win",
+    "enter me please",
+    "I want to enter",
+    "can I still enter",
+    "is the contest still open",
+    "I have a receipt and want to enter",
+    "how do I join the contest",
+    "what prizes can I win",
+    "I want a chance to win",
+    "register me for the draw",
+    "I'd like to try my luck at the prize",
+    "put my name in the draw",
+    "count me in for the giveaway",
+    "how many times can I enter the contest",
+    "submit my entry for the prize",
+    "I want to claim my entry",
+    "what do I need to enter the giveaway",
+    "can I win with a receipt under 20",
+    "let me enter the sweepstakes",
+    "I want to join the sweepstake",
+    "how to participate and win",
+    "is there a prize for customers",
+    "I'd love to win, how do I sign up",
+    "I want to enter with my purchase",
+    "upload my receipt for the contest",
+    "how do I become eligible to win",
+]
+
+OTHER_EXAMPLES = [
+    "how do I enter setup mode",
+    "how do I enter the bios",
+    "how do I enter safe mode",
+    "how do I enter debug mode on the device",
+    "how do I enter maintenance mode",
+    "how do I enter the settings menu",
+    "how do I enter my credentials in the app",
+    "how do I enter a new line in the text",
+    "press enter to continue, what happens next",
+    "what does the enter key do in the editor",
+    "how to enter data into the table",
+    "what is the win rate of the model",
+    "which team will win according to the report",
+    "how did the company win the contract",
+    "does the strategy win against the baseline",
+    "draw a diagram of the architecture",
+    "how do I draw a chart from the data",
+    "what can we draw from these results",
+    "explain the prize-collecting steiner tree problem",
+    "who won the nobel prize mentioned in the paper",
+    "what is the prize money mentioned in the document",
+    "summarize the contest rules section of the policy",
+    "what does the document say about the programming contest",
+    "is the giveaway mentioned in the marketing plan legal",
+    "what is a sweepstakes law",
+    "how does the power draw of the device compare",
+    "what is the current draw of the motor",
+    "explain the win32 api",
+    "what are the windows requirements to win",
+    "enter the password where",
+    "how do I enter a formula in excel",
+    "what does enter mean in the context of the protocol",
+    "what is the draw distance setting",
+    "how is the contest between the two algorithms decided",
+    "what happens when you enter a new market",
+    "list the entry points of the program",
+    "how does the model win over transformers",
+    "describe the prize structure in the incentive program of the report",
+    "what are the rules to enter the country",
+    "who is the winner of the benchmark",
+    "tips to win a negotiation from the book",
+]
@@ -17,7 +17,7 @@ class EntryStatus(Enum):
     APPLIED = "applied"
 
 
-@dataclass
+@dataclass(slots=True)
 class ReceiptData:
     receipt_no: int
     amount: float
@@ -31,7 +31,7 @@ class UserDetails:
     email: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FlowState:
     step: LuckyDrawStep = LuckyDrawStep.INACTIVE
     receipt: Optional[ReceiptData] = None
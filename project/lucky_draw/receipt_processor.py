@@ -8,7 +8,7 @@ class ReceiptProcessor:
         self.db = db
 
     def process(self) -> ReceiptData:
-        next_no = self.db.get_max_receipt_no() + 1
+        next_no = self.db.allocate_receipt_no()
         return ReceiptData(
             receipt_no=next_no,
             amount=25.00,
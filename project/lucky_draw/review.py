@@ -0,0 +1,160 @@
+import csv
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional
+from .database import LuckyDrawDB
+from .models import EntryStatus
+
+EXPORT_COLUMNS = [
+    "id", "receipt_no", "name", "phone_number", "email", "transaction_amount",
+    "confidence_level", "status", "created_at", "approved_at",
+]
+
+
+def encode_cursor(row: dict) -> str:
+    return f"{row['created_at']}|{row['id']}"
+
+
+def decode_cursor(cursor: str) -> tuple:
+    created_at, entry_id = cursor.rsplit("|", 1)
+    return created_at, int(entry_id)
+
+
+class EntryReview:
+    """Batch review of lucky-draw entries on top of ``LuckyDrawDB``.
+
+    Listing and export page through entries by ``(created_at, id)`` keyset,
+    so memory use does not grow with the table. Status transitions and the
+    duplicate-phone rule are set-wise UPDATEs, each run as a single
+    transaction. Date filters are inclusive ``YYYY-MM-DD[ HH:MM:SS]`` strings
+    in UTC, compared against ``created_at``.
+    """
+
+    def __init__(self, db: LuckyDrawDB, page_size: int = 1000):
+        self.db = db
+        self.page_size = page_size
+
+    @staticmethod
+    def _filters(status: Optional[EntryStatus], since: Optional[str], until: Optional[str], min_confidence: Optional[float] = None):
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until:
+            # A bare date covers the whole day
+            clauses.append("created_at <= ?")
+            params.append(until if len(until) > 10 else f"{until} 23:59:59")
+        if min_confidence is not None:
+            clauses.append("confidence_level >= ?")
+            params.append(min_confidence)
+        return clauses, params
+
+    def list_entries(self, status: Optional[EntryStatus] = None, since: Optional[str] = None, until: Optional[str] = None,
+                     after: Optional[str] = None, limit: int = 50):
+        """Return one page of entries, oldest first, and the cursor of the next page (None on the last page)."""
+        clauses, params = self._filters(status, since, until)
+        if after:
+            clauses.append("(created_at, id) > (?, ?)")
+            params.extend(decode_cursor(after))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self.db._get_conn() as conn:
+            rows = [dict(row) for row in conn.execute(
+                f"SELECT * FROM lucky_draw_entries {where} ORDER BY created_at, id LIMIT ?",
+                params + [limit + 1]
+            )]
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def iter_entries(self, status: Optional[EntryStatus] = None, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[dict]:
+        cursor = None
+        while True:
+            rows, cursor = self.list_entries(status, since, until, after=cursor, limit=self.page_size)
+            yield from rows
+            if cursor is None:
+                return
+
+    def count_by_status(self) -> dict:
+        with self.db._get_conn() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM lucky_draw_entries GROUP BY status").fetchall())
+
+    def approve(self, ids: Optional[Iterable[int]] = None, **filters) -> dict:
+        """Approve pending entries (by ID or by filter), then re-apply the duplicate-phone rule to their phone numbers.
+
+        Returns the number of entries approved and the number of entries
+        (from this batch or earlier) demoted to ``applied`` because their phone
+        number already had an approved entry.
+        """
+        approved_at = datetime.now(timezone.utc).isoformat()
+        with self.db._get_conn() as conn:
+            approved = self._transition(conn, EntryStatus.APPROVED, approved_at, ids, filters, track_phones=True)
+            duplicates = self._apply_duplicate_rule(conn, "SELECT phone_number FROM review_phones")
+        return {"approved": approved, "applied": duplicates}
+
+    def reject(self, ids: Optional[Iterable[int]] = None, **filters) -> dict:
+        with self.db._get_conn() as conn:
+            return {"rejected": self._transition(conn, EntryStatus.REJECTED, None, ids, filters)}
+
+    def apply_duplicate_rule(self) -> int:
+        """Mark pending and approved entries as applied when their phone number has another approved entry.
+
+        The earliest approved entry (by ``approved_at``, then ``id``) of each
+        phone number is the one kept.
+        """
+        with self.db._get_conn() as conn:
+            return self._apply_duplicate_rule(conn, "SELECT DISTINCT phone_number FROM lucky_draw_entries WHERE status = 'approved'")
+
+    def _transition(self, conn, target: EntryStatus, approved_at, ids, filters, track_phones=False) -> int:
+        clauses, params = self._filters(EntryStatus.PENDING, filters.get("since"), filters.get("until"), filters.get("min_confidence"))
+        if ids is not None:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS review_ids (id INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM review_ids")
+            conn.executemany("INSERT OR IGNORE INTO review_ids (id) VALUES (?)", ((int(i),) for i in ids))
+            clauses.append("id IN (SELECT id FROM review_ids)")
+        where = " AND ".join(clauses)
+        if track_phones:
+            # Same transaction, so exactly the phone numbers of the entries updated below
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS review_phones (phone_number TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM review_phones")
+            conn.execute(f"INSERT OR IGNORE INTO review_phones SELECT phone_number FROM lucky_draw_entries WHERE {where}", params)
+        return conn.execute(
+            f"UPDATE lucky_draw_entries SET status = ?, approved_at = ? WHERE {where}",
+            [target.value, approved_at] + params
+        ).rowcount
+
+    @staticmethod
+    def _apply_duplicate_rule(conn, phones_sql: str) -> int:
+        # The earliest approved entry per phone number keeps its approval, so a newly approved duplicate is the one demoted
+        conn.execute("DROP TABLE IF EXISTS temp.approved_keepers")
+        conn.execute("CREATE TEMP TABLE approved_keepers (phone_number TEXT PRIMARY KEY, id INTEGER NOT NULL)")
+        conn.execute(f"""
+            INSERT INTO approved_keepers (phone_number, id)
+            SELECT phone_number, keeper_id FROM (
+                SELECT p.phone_number, (
+                    SELECT e.id FROM lucky_draw_entries e
+                    WHERE e.phone_number = p.phone_number AND e.status = 'approved'
+                    ORDER BY e.approved_at, e.id LIMIT 1
+                ) AS keeper_id
+                FROM ({phones_sql}) p
+            ) WHERE keeper_id IS NOT NULL
+        """)
+        demoted = conn.execute("""
+            UPDATE lucky_draw_entries SET status = 'applied', approved_at = NULL
+            WHERE phone_number IN (SELECT phone_number FROM approved_keepers)
+              AND status IN ('approved', 'pending')
+              AND id NOT IN (SELECT id FROM approved_keepers)
+        """).rowcount
+        conn.execute("DROP TABLE temp.approved_keepers")
+        return demoted
+
+    def export_csv(self, out, status: Optional[EntryStatus] = None, since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """Stream matching entries to a text file object as CSV; returns the number of rows written."""
+        writer = csv.DictWriter(out, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        written = 0
+        for row in self.iter_entries(status, since, until):
+            writer.writerow(row)
+            written += 1
+        return written
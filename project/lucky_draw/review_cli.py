@@ -0,0 +1,99 @@
+"""Review lucky-draw entries in bulk.
+
+Run from the project directory:
+
+    python -m lucky_draw.review_cli stats
+    python -m lucky_draw.review_cli list --status pending --since 2025-01-01 --limit 20
+    python -m lucky_draw.review_cli list --status pending --after "2025-01-03 10:22:01|1532"
+    python -m lucky_draw.review_cli approve --ids 12 15 18
+    python -m lucky_draw.review_cli approve --all --until 2025-01-31 --min-confidence 80
+    python -m lucky_draw.review_cli reject --all --until 2024-12-31
+    python -m lucky_draw.review_cli dedupe
+    python -m lucky_draw.review_cli export --status approved --output approved.csv
+
+approve/reject only touch pending entries; --all applies to every pending
+entry matching the date/confidence filters.
+"""
+import argparse
+import sys
+import config
+from .database import LuckyDrawDB
+from .models import EntryStatus
+from .review import EntryReview
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=config.LUCKY_DRAW_DB_PATH, help="lucky draw database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("stats", help="count entries per status")
+
+    def add_date_filters(command):
+        command.add_argument("--since", help="created on or after (YYYY-MM-DD[ HH:MM:SS], UTC)")
+        command.add_argument("--until", help="created on or before (YYYY-MM-DD[ HH:MM:SS], UTC)")
+
+    statuses = [s.value for s in EntryStatus]
+    list_cmd = commands.add_parser("list", help="list one page of entries")
+    list_cmd.add_argument("--status", choices=statuses)
+    add_date_filters(list_cmd)
+    list_cmd.add_argument("--after", help="cursor printed at the end of the previous page")
+    list_cmd.add_argument("--limit", type=int, default=50)
+
+    for name in ("approve", "reject"):
+        cmd = commands.add_parser(name, help=f"{name} pending entries")
+        target = cmd.add_mutually_exclusive_group(required=True)
+        target.add_argument("--ids", type=int, nargs="+", help="entry IDs")
+        target.add_argument("--all", action="store_true", help="every pending entry matching the filters")
+        add_date_filters(cmd)
+        cmd.add_argument("--min-confidence", type=float)
+
+    commands.add_parser("dedupe", help="re-apply the duplicate-phone rule to pending and approved entries")
+
+    export_cmd = commands.add_parser("export", help="stream entries as CSV")
+    export_cmd.add_argument("--status", choices=statuses)
+    add_date_filters(export_cmd)
+    export_cmd.add_argument("--output", help="CSV file (default: stdout)")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = LuckyDrawDB(args.db)
+    review = EntryReview(db)
+    status = EntryStatus(args.status) if getattr(args, "status", None) else None
+
+    if args.command == "stats":
+        for name, count in sorted(review.count_by_status().items()):
+            print(f"{name:10s} {count}")
+
+    elif args.command == "list":
+        rows, cursor = review.list_entries(status, args.since, args.until, after=args.after, limit=args.limit)
+        for row in rows:
+            print(f"{row['id']:>8}  #{row['receipt_no']:<8} {row['status']:9s} {row['created_at']}  "
+                  f"{row['confidence_level']:5.1f}%  {row['transaction_amount']:8.2f}  {row['phone_number']}  {row['name']}")
+        print(f"\nNext page: --after \"{cursor}\"" if cursor else "\nEnd of results.")
+
+    elif args.command in ("approve", "reject"):
+        filters = {"since": args.since, "until": args.until, "min_confidence": args.min_confidence}
+        action = review.approve if args.command == "approve" else review.reject
+        result = action(ids=args.ids, **filters)
+        print(", ".join(f"{name}: {count}" for name, count in result.items()))
+
+    elif args.command == "dedupe":
+        print(f"applied: {review.apply_duplicate_rule()}")
+
+    elif args.command == "export":
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as out:
+                written = review.export_csv(out, status, args.since, args.until)
+            print(f"✓ Exported {written} entries to {args.output}")
+        else:
+            review.export_csv(sys.stdout, status, args.since, args.until)
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
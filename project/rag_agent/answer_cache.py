@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+import config
+
+class SemanticAnswerCache:
+    """Final answers keyed by the dense embedding of the rewritten questions.
+
+    Paraphrases of an answered question rewrite to nearly identical questions,
+    so a lookup is a cosine-similarity search over the cached keys: the best
+    match at or above ``threshold`` that is younger than ``ttl_seconds`` is a
+    hit. Beyond ``max_entries`` the least recently used answer is evicted.
+
+    Answers are stored with the ``corpus_version`` their turn started under,
+    which ``bump_version`` increments whenever the indexed documents change;
+    an answer whose version is no longer current is never stored or served,
+    so a turn that straddles an ingestion or clear cannot cache a stale answer.
+    """
+
+    def __init__(self, embed_query, threshold=config.ANSWER_CACHE_SIMILARITY,
+                 ttl_seconds=config.ANSWER_CACHE_TTL_SECONDS, max_entries=config.ANSWER_CACHE_MAX_ENTRIES):
+        self.embed_query = embed_query
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.corpus_version = 0
+        self.__entries = OrderedDict()  # key -> (unit vector, answer, created_at, corpus_version)
+        self.__matrix = None
+        self.__keys = []
+        self.__next_key = 0
+        self.__lock = threading.Lock()
+
+    def _embed(self, questions: List[str]) -> np.ndarray:
+        vector = np.asarray(self.embed_query("\n".join(questions)), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(self, questions: List[str]) -> Optional[str]:
+        if not questions:
+            return None
+        vector = self._embed(questions)
+
+        with self.__lock:
+            self.__drop_stale()
+            if self.__entries:
+                if self.__matrix is None:
+                    self.__keys = list(self.__entries)
+                    self.__matrix = np.stack([self.__entries[k][0] for k in self.__keys])
+                scores = self.__matrix @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    key = self.__keys[best]
+                    self.__entries.move_to_end(key)
+                    self.hits += 1
+                    return self.__entries[key][1]
+            self.misses += 1
+            return None
+
+    def store(self, questions: List[str], answer: str, corpus_version: int) -> None:
+        """Cache an answer produced by a turn that started under ``corpus_version``."""
+        if not questions or corpus_version != self.corpus_version:
+            return
+        vector = self._embed(questions)
+
+        with self.__lock:
+            if corpus_version != self.corpus_version:
+                return
+            self.__entries[self.__next_key] = (vector, answer, time.monotonic(), corpus_version)
+            self.__next_key += 1
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+            self.__matrix = None
+
+    def __drop_stale(self) -> None:
+        now = time.monotonic()
+        stale = [
+            k for k, (_, _, created_at, corpus_version) in self.__entries.items()
+            if now - created_at > self.ttl_seconds or corpus_version != self.corpus_version
+        ]
+        for key in stale:
+            del self.__entries[key]
+        if stale:
+            self.__matrix = None
+
+    def bump_version(self) -> None:
+        with self.__lock:
+            self.corpus_version += 1
+            self.__entries.clear()
+            self.__matrix = None
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__matrix = None
@@ -0,0 +1,185 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+import aiosqlite
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+import config
+
+
+class _LazyAsyncSqliteSaver(AsyncSqliteSaver):
+    """``AsyncSqliteSaver`` that can be created before the event loop is running.
+
+    The base constructor binds to the running loop, so building it at startup
+    fails. This one opens its connection and binds to the loop on its first
+    async call (every read and write starts with ``setup``).
+    """
+
+    def __init__(self, db_path: str):
+        BaseCheckpointSaver.__init__(self)
+        self.jsonplus_serde = JsonPlusSerializer()
+        self.conn = aiosqlite.connect(db_path)
+        # Its worker thread would otherwise keep scripts that never close it from exiting
+        self.conn.daemon = True
+        self.lock = asyncio.Lock()
+        self.loop = None
+        self.is_setup = False
+
+    async def setup(self) -> None:
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        await super().setup()
+
+
+class CheckpointStore:
+    """Owns the graph checkpointer and keeps its history bounded.
+
+    With the ``sqlite`` backend checkpoints live in a file, so threads survive
+    restarts, and only the latest ``keep_last`` checkpoints of each thread are
+    retained: ``prune_thread`` runs after every turn, dropping older root
+    checkpoints, the per-branch checkpoints of finished ``process_question``
+    subgraphs and their pending writes. ``compact`` prunes every thread and
+    reclaims the freed pages; ``start_compaction`` runs it periodically.
+
+    The session -> thread mapping is stored next to the checkpoints, so a
+    session reconnecting after a restart finds its thread again. ``compact``
+    also deletes threads whose session was last seen more than
+    ``thread_max_age`` seconds ago and threads no session refers to.
+
+    The ``memory`` backend keeps the previous in-process behavior.
+    """
+
+    def __init__(self, backend=config.CHECKPOINT_BACKEND, db_path=config.CHECKPOINT_DB_PATH, keep_last=config.CHECKPOINT_KEEP_LAST,
+                 thread_max_age=config.CHECKPOINT_THREAD_MAX_AGE_SECONDS):
+        self.backend = backend
+        self.keep_last = keep_last
+        self.thread_max_age = thread_max_age
+        self.__conn = None
+
+        if backend == "sqlite":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            # Maintenance uses its own connection; WAL lets it run alongside the saver's writes
+            self.__conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self.__conn.execute("PRAGMA journal_mode=WAL")
+            with self.__conn:
+                self.__conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        session_id TEXT PRIMARY KEY,
+                        thread_id TEXT NOT NULL,
+                        last_seen REAL NOT NULL
+                    )
+                """)
+                self.__conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_thread ON sessions(thread_id)")
+            self.__lock = threading.Lock()
+            self.saver = _LazyAsyncSqliteSaver(db_path)
+        else:
+            self.saver = InMemorySaver()
+
+    def __has_tables(self) -> bool:
+        # The saver creates its tables lazily on first use
+        return self.__conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('checkpoints', 'writes')"
+        ).fetchone()[0] == 2
+
+    def load_session(self, session_id: str) -> Optional[Tuple[str, float]]:
+        """The stored ``(thread_id, last_seen)`` of a session, or None."""
+        if self.__conn is None:
+            return None
+        with self.__lock:
+            return self.__conn.execute(
+                "SELECT thread_id, last_seen FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+
+    def save_session(self, session_id: str, thread_id: str) -> None:
+        if self.__conn is None:
+            return
+        with self.__lock, self.__conn:
+            self.__conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, thread_id, last_seen) VALUES (?, ?, ?)",
+                (session_id, thread_id, time.time()),
+            )
+
+    def delete_session(self, session_id: str) -> None:
+        if self.__conn is None:
+            return
+        with self.__lock, self.__conn:
+            self.__conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def delete_thread(self, thread_id: str) -> None:
+        if self.__conn is None:
+            self.saver.delete_thread(thread_id)
+            return
+        with self.__lock, self.__conn:
+            if self.__has_tables():
+                self.__conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                self.__conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    def prune_thread(self, thread_id: str) -> None:
+        if self.__conn is not None:
+            self.__prune("thread_id = ?", (thread_id,))
+
+    def __prune(self, where: str, params: tuple) -> None:
+        with self.__lock, self.__conn:
+            if not self.__has_tables():
+                return
+            self.__conn.execute(f"DELETE FROM checkpoints WHERE {where} AND checkpoint_ns != ''", params)
+            self.__conn.execute(f"""
+                DELETE FROM checkpoints WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY thread_id ORDER BY checkpoint_id DESC
+                        ) AS rank
+                        FROM checkpoints WHERE {where}
+                    ) WHERE rank > ?
+                )
+            """, params + (self.keep_last,))
+            self.__conn.execute(f"""
+                DELETE FROM writes WHERE {where} AND NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = writes.thread_id
+                      AND c.checkpoint_ns = writes.checkpoint_ns
+                      AND c.checkpoint_id = writes.checkpoint_id
+                )
+            """, params)
+
+    def __delete_stale_threads(self) -> int:
+        with self.__lock, self.__conn:
+            self.__conn.execute("DELETE FROM sessions WHERE last_seen < ?", (time.time() - self.thread_max_age,))
+            if not self.__has_tables():
+                return 0
+            # A session's row is written before its first checkpoint, so live threads are never unreferenced
+            stale = "thread_id NOT IN (SELECT thread_id FROM sessions)"
+            threads = self.__conn.execute(f"SELECT COUNT(DISTINCT thread_id) FROM checkpoints WHERE {stale}").fetchone()[0]
+            self.__conn.execute(f"DELETE FROM checkpoints WHERE {stale}")
+            self.__conn.execute(f"DELETE FROM writes WHERE {stale}")
+            return threads
+
+    def compact(self) -> None:
+        if self.__conn is None:
+            return
+        start = time.perf_counter()
+        stale = self.__delete_stale_threads()
+        self.__prune("1 = 1", ())
+        with self.__lock:
+            self.__conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.__conn.execute("VACUUM")
+        print(f"✓ Checkpoint store compacted in {time.perf_counter() - start:.1f}s ({stale} stale thread(s) deleted)")
+
+    def start_compaction(self, interval_seconds=config.CHECKPOINT_COMPACTION_INTERVAL_SECONDS) -> None:
+        if self.__conn is None or not interval_seconds:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval_seconds)
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"Warning: checkpoint compaction failed: {e}")
+
+        threading.Thread(target=run, name="checkpoint-compaction", daemon=True).start()
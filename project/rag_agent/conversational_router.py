@@ -0,0 +1,113 @@
+import re
+import threading
+import numpy as np
+import config
+
+# Whole-message matches — greetings, thanks, small talk and questions about the assistant or the chat
+CONVERSATIONAL_PATTERNS = re.compile(
+    r"(?:hi|hello|hey|hiya|yo|good\s+(?:morning|afternoon|evening)|greetings)(?:\s+there)?"
+    r"|(?:thanks?|thank\s+you|thx|ty|cheers)(?:\s+(?:so\s+much|a\s+lot|very\s+much))?"
+    r"|(?:ok(?:ay)?|cool|great|nice|perfect|got\s+it|i\s+see|understood|awesome)"
+    r"|(?:bye|goodbye|see\s+you(?:\s+later)?|good\s*night)"
+    r"|how\s+are\s+you(?:\s+doing)?(?:\s+today)?"
+    r"|(?:what|how)\s+can\s+you\s+(?:do|help(?:\s+me)?)"
+    r"|who\s+are\s+you|what\s+are\s+you"
+    r"|what\s+(?:have|did)\s+i\s+(?:just\s+)?ask(?:ed)?(?:\s+you)?(?:\s+so\s+far)?"
+    r"|what\s+did\s+you\s+(?:just\s+)?say"
+    r"|(?:can\s+you\s+)?summari[sz]e\s+(?:our|this|the)\s+(?:chat|conversation)",
+    re.IGNORECASE,
+)
+
+# Nearest-exemplar tier: a short message close to one of these, and closer to them than
+# to any topical question, is treated as conversational
+CONVERSATIONAL_EXEMPLARS = [
+    "hello, how is it going?",
+    "hey, nice to meet you",
+    "thanks, that was really helpful",
+    "thank you for the explanation",
+    "that's all for now, goodbye",
+    "what kind of questions can I ask you?",
+    "what are you able to help me with?",
+    "tell me about yourself",
+    "remind me what we talked about",
+    "what was my previous question?",
+    "can you recap our conversation?",
+    "how's your day going?",
+]
+
+TOPICAL_EXEMPLARS = [
+    "what is blockchain?",
+    "tell me about microservices",
+    "explain how the algorithm works",
+    "what does the document say about pricing?",
+    "how do I configure the system?",
+    "what are the advantages and disadvantages?",
+    "summarize the report",
+    "who is the author of the paper?",
+]
+
+
+class ConversationalRouter:
+    """First-tier router that recognizes purely conversational messages without the LLM.
+
+    A message is conversational if it fully matches ``CONVERSATIONAL_PATTERNS``,
+    or if it is at most ``max_words`` long and its dense embedding is at least
+    ``threshold`` similar to a conversational exemplar and closer to it than to
+    any topical one. Anything else is ambiguous and left to the LLM analysis,
+    whose latency is tracked to report the time saved by local decisions.
+    """
+
+    def __init__(self, embed_query, threshold=config.CONVERSATIONAL_ROUTER_SIMILARITY, max_words=config.CONVERSATIONAL_ROUTER_MAX_WORDS):
+        self.embed_query = embed_query
+        self.threshold = threshold
+        self.max_words = max_words
+        self.local_decisions = 0
+        self.llm_decisions = 0
+        self.__llm_seconds = 0.0
+        self.__exemplars = None
+        self.__lock = threading.Lock()
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embed_query(text), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def __load_exemplars(self):
+        with self.__lock:
+            if self.__exemplars is None:
+                self.__exemplars = (
+                    np.stack([self._embed(text) for text in CONVERSATIONAL_EXEMPLARS]),
+                    np.stack([self._embed(text) for text in TOPICAL_EXEMPLARS]),
+                )
+        return self.__exemplars
+
+    def route(self, text: str):
+        """Return ("conversational", tier) when confident, otherwise (None, None)."""
+        normalized = re.sub(r"[^\w\s']", " ", text).strip()
+        if not normalized:
+            return None, None
+        if CONVERSATIONAL_PATTERNS.fullmatch(" ".join(normalized.split())):
+            return "conversational", "pattern"
+        if len(normalized.split()) > self.max_words:
+            return None, None
+
+        conversational, topical = self.__load_exemplars()
+        vector = self._embed(text)
+        best_conversational = float((conversational @ vector).max())
+        if best_conversational >= self.threshold and best_conversational > float((topical @ vector).max()):
+            return "conversational", "exemplar"
+        return None, None
+
+    def record_local(self, text: str, tier: str, seconds: float) -> None:
+        self.local_decisions += 1
+        saved = self.average_llm_seconds()
+        saved_note = f", saved ~{saved:.1f}s" if saved else ""
+        print(f"✓ Router: {text[:40]!r} → conversational via {tier} in {seconds * 1000:.0f}ms{saved_note} "
+              f"({self.local_decisions} local / {self.llm_decisions} LLM decisions)")
+
+    def record_llm(self, text: str, route: str, seconds: float) -> None:
+        self.llm_decisions += 1
+        self.__llm_seconds += seconds
+        print(f"✓ Router: {text[:40]!r} → {route} via LLM analysis in {seconds:.1f}s")
+
+    def average_llm_seconds(self) -> float:
+        return self.__llm_seconds / self.llm_decisions if self.llm_decisions else 0.0
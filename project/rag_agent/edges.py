@@ -1,14 +1,20 @@
 from typing import Literal, Union, List
+from langgraph.graph import END
 from langgraph.types import Send
 from .graph_state import State
 
-def route_after_rewrite(state: State) -> Union[Literal["human_input", "conversational_response"], List[Send]]:
+def route_after_rewrite(state: State) -> Literal["human_input", "conversational_response", "check_answer_cache"]:
     if state.get("route") == "conversational":
         return "conversational_response"
     elif not state.get("questionIsClear", False):
         return "human_input"
     else:
-        return [
-            Send("process_question", {"question": query, "question_index": idx, "messages": []})
-            for idx, query in enumerate(state["rewrittenQuestions"])
-        ]
+        return "check_answer_cache"
+
+def route_after_cache_check(state: State) -> Union[Literal["__end__"], List[Send]]:
+    if state.get("cacheHit", False):
+        return END
+    return [
+        Send("process_question", {"question": query, "question_index": idx, "messages": []})
+        for idx, query in enumerate(state["rewrittenQuestions"])
+    ]
@@ -1,21 +1,19 @@
 from langgraph.graph import START, END, StateGraph
-from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.prebuilt import ToolNode, tools_condition
 from functools import partial
+import config
 
 from .graph_state import State
 from .nodes import *
 from .edges import *
 
-def create_agent_graph(llm, tools_list, collection=None, get_document_sources=None):
+def create_agent_graph(llm, tools_list, checkpointer, catalog=None, answer_cache=None, router=None):
     llm_with_tools = llm.bind_tools(tools_list)
     tool_node = ToolNode(tools_list)
 
-    checkpointer = InMemorySaver()
-
     print("Compiling agent graph...")
     agent_builder = StateGraph(AgentState)
-    agent_builder.add_node("agent", partial(agent_node, llm_with_tools=llm_with_tools))
+    agent_builder.add_node("agent", partial(agent_node, llm_with_tools=llm_with_tools, one_hop=config.RETRIEVAL_MODE == "one_hop"))
     agent_builder.add_node("tools", tool_node)
     agent_builder.add_node("extract_answer", extract_final_answer)
     
@@ -27,16 +25,16 @@ def create_agent_graph(llm, tools_list, collection=None, get_document_sources=No
     agent_subgraph = agent_builder.compile()
     
     graph_builder = StateGraph(State)
-    graph_builder.add_node("summarize", partial(analyze_chat_and_summarize, llm=llm))
-    graph_builder.add_node("analyze_rewrite", partial(analyze_and_rewrite_query, llm=llm))
+    graph_builder.add_node("analyze_rewrite", partial(analyze_and_rewrite_query, llm=llm, router=router))
     graph_builder.add_node("human_input", human_input_node)
+    graph_builder.add_node("check_answer_cache", partial(check_answer_cache, answer_cache=answer_cache))
     graph_builder.add_node("process_question", agent_subgraph)
-    graph_builder.add_node("aggregate", partial(aggregate_responses, llm=llm, collection=collection, get_document_sources=get_document_sources))
-    graph_builder.add_node("conversational_response", partial(conversational_response, llm=llm, collection=collection, get_document_sources=get_document_sources))
+    graph_builder.add_node("aggregate", partial(aggregate_responses, llm=llm, catalog=catalog, answer_cache=answer_cache))
+    graph_builder.add_node("conversational_response", partial(conversational_response, llm=llm, catalog=catalog))
 
-    graph_builder.add_edge(START, "summarize")
-    graph_builder.add_edge("summarize", "analyze_rewrite")
+    graph_builder.add_edge(START, "analyze_rewrite")
     graph_builder.add_conditional_edges("analyze_rewrite", route_after_rewrite)
+    graph_builder.add_conditional_edges("check_answer_cache", route_after_cache_check)
     graph_builder.add_edge("human_input", "analyze_rewrite")
     graph_builder.add_edge(["process_question"], "aggregate")
     graph_builder.add_edge("aggregate", END)
@@ -14,6 +14,8 @@ class State(MessagesState):
     rewrittenQuestions: List[str] = []
     agent_answers: Annotated[List[dict], accumulate_or_reset] = []
     route: str = "rag"
+    cacheHit: bool = False
+    corpusVersion: int = 0
 
 class AgentState(MessagesState):
     """State for individual agent subgraph"""
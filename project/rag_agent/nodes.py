@@ -1,82 +1,65 @@
-from langchain_core.messages import SystemMessage, HumanMessage, RemoveMessage, AIMessage
+import asyncio
+import time
+from langchain_core.messages import SystemMessage, HumanMessage, RemoveMessage, AIMessage, trim_messages
+from langchain_core.messages.utils import count_tokens_approximately
 from .graph_state import State, AgentState
 from .schemas import QueryAnalysis
 from .prompts import *
-from qdrant_client.http import models as qmodels
-
-def _sample_document_snippets(collection, document_sources, chunks_per_doc=3):
-    """Sample random chunks from each document to build content snippets."""
-    if not collection or not document_sources:
-        return None
-    try:
-        all_snippets = []
-        for source in document_sources:
-            result = collection.client.query_points(
-                collection_name=collection.collection_name,
-                query=qmodels.SampleQuery(sample=qmodels.Sample.RANDOM),
-                query_filter=qmodels.Filter(
-                    must=[qmodels.FieldCondition(
-                        key="metadata.source",
-                        match=qmodels.MatchValue(value=source),
-                    )]
-                ),
-                limit=chunks_per_doc,
-                with_payload=True,
-            )
-            for point in result.points:
-                all_snippets.append(
-                    f"- [{point.payload.get('metadata', {}).get('source', 'unknown')}] "
-                    f"{point.payload.get('page_content', '')[:200].strip()}"
-                )
-        return "\n".join(all_snippets) if all_snippets else None
-    except Exception:
-        return None
-
-
-def analyze_chat_and_summarize(state: State, llm):
-    if len(state["messages"]) < 4:
-        return {"conversation_summary": ""}
-
-    relevant_msgs = [
-        msg for msg in state["messages"][:-1]
-        if isinstance(msg, (HumanMessage, AIMessage))
-        and not getattr(msg, "tool_calls", None)
-    ]
-
-    if not relevant_msgs:
-        return {"conversation_summary": ""}
 
-    existing_summary = state.get("conversation_summary", "")
-
-    new_messages = "Recent messages:\n"
-    for msg in relevant_msgs[-6:]:
-        role = "User" if isinstance(msg, HumanMessage) else "Assistant"
-        new_messages += f"{role}: {msg.content}\n"
+async def summarize_turn(llm, existing_summary: str, turn_messages, max_tokens: int) -> str:
+    """Fold one finished turn into the running conversation summary.
+
+    Runs in the background after the reply is delivered; only the turn's own
+    messages are sent, trimmed to the last ``max_tokens`` (approximate) tokens.
+    """
+    window = trim_messages(
+        [msg for msg in turn_messages if msg.content],
+        max_tokens=max_tokens,
+        token_counter=count_tokens_approximately,
+        strategy="last",
+        allow_partial=True,
+    )
+    if not window:
+        return existing_summary
 
     context = ""
     if existing_summary.strip():
         context = f"Existing summary of earlier conversation:\n{existing_summary}\n\n"
-    context += new_messages
+    context += "Recent messages:\n"
+    for msg in window:
+        role = "User" if isinstance(msg, HumanMessage) else "Assistant"
+        context += f"{role}: {msg.content}\n"
 
-    summary_response = llm.with_config(temperature=0.2).invoke([SystemMessage(content=get_conversation_summary_prompt())] + [HumanMessage(content=context)])
-    return {"conversation_summary": summary_response.content, "agent_answers": [{"__reset__": True}]}
+    summary_response = await llm.with_config(temperature=0.2).ainvoke([SystemMessage(content=get_conversation_summary_prompt())] + [HumanMessage(content=context)])
+    return summary_response.content
 
-def analyze_and_rewrite_query(state: State, llm):
+async def analyze_and_rewrite_query(state: State, llm, router=None):
     last_message = state["messages"][-1]
     conversation_summary = state.get("conversation_summary", "")
+    conversational = {
+        "route": "conversational",
+        "questionIsClear": True,
+        "originalQuery": last_message.content,
+        "rewrittenQuestions": []
+    }
+
+    if router is not None:
+        start = time.perf_counter()
+        route, tier = await asyncio.to_thread(router.route, last_message.content)
+        if route == "conversational":
+            router.record_local(last_message.content, tier, time.perf_counter() - start)
+            return conversational
 
     context_section = (f"Conversation Context:\n{conversation_summary}\n" if conversation_summary.strip() else "") + f"User Query:\n{last_message.content}\n"
 
+    start = time.perf_counter()
     llm_with_structure = llm.with_config(temperature=0.1).with_structured_output(QueryAnalysis)
-    response = llm_with_structure.invoke([SystemMessage(content=get_query_analysis_prompt())] + [HumanMessage(content=context_section)])
+    response = await llm_with_structure.ainvoke([SystemMessage(content=get_query_analysis_prompt())] + [HumanMessage(content=context_section)])
+    if router is not None:
+        router.record_llm(last_message.content, response.route, time.perf_counter() - start)
 
     if response.route == "conversational":
-        return {
-            "route": "conversational",
-            "questionIsClear": True,
-            "originalQuery": last_message.content,
-            "rewrittenQuestions": []
-        }
+        return conversational
 
     if len(response.questions) > 0 and response.is_clear:
         delete_all = [
@@ -89,7 +72,8 @@ def analyze_and_rewrite_query(state: State, llm):
             "questionIsClear": True,
             "messages": delete_all,
             "originalQuery": last_message.content,
-            "rewrittenQuestions": response.questions
+            "rewrittenQuestions": response.questions,
+            "agent_answers": [{"__reset__": True}]
         }
     else:
         clarification = response.clarification_needed if (response.clarification_needed and len(response.clarification_needed.strip()) > 10) else "I need more information to understand your question."
@@ -102,14 +86,24 @@ def analyze_and_rewrite_query(state: State, llm):
 def human_input_node(state: State):
     return {}
 
-def agent_node(state: AgentState, llm_with_tools):
-    sys_msg = SystemMessage(content=get_rag_agent_prompt())    
+async def check_answer_cache(state: State, answer_cache=None):
+    if answer_cache is None:
+        return {"cacheHit": False}
+    # Read before retrieval starts; aggregate_responses only caches the answer if it is still current
+    corpus_version = answer_cache.corpus_version
+    cached = await asyncio.to_thread(answer_cache.lookup, state["rewrittenQuestions"])
+    if cached is None:
+        return {"cacheHit": False, "corpusVersion": corpus_version}
+    return {"cacheHit": True, "messages": [AIMessage(content=cached)]}
+
+async def agent_node(state: AgentState, llm_with_tools, one_hop=False):
+    sys_msg = SystemMessage(content=get_rag_agent_prompt(one_hop))    
     if not state.get("messages"):
         human_msg = HumanMessage(content=state["question"])
-        response = llm_with_tools.invoke([sys_msg] + [human_msg])
+        response = await llm_with_tools.ainvoke([sys_msg] + [human_msg])
         return {"messages": [human_msg, response]}
     
-    return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
+    return {"messages": [await llm_with_tools.ainvoke([sys_msg] + state["messages"])]}
 
 def extract_final_answer(state: AgentState):
     for msg in reversed(state["messages"]):
@@ -132,7 +126,7 @@ def extract_final_answer(state: AgentState):
         }]
     }
 
-def aggregate_responses(state: State, llm, collection=None, get_document_sources=None):
+async def aggregate_responses(state: State, llm, catalog=None, answer_cache=None):
     if not state.get("agent_answers"):
         return {"messages": [AIMessage(content="No answers were generated.")]}
 
@@ -143,7 +137,7 @@ def aggregate_responses(state: State, llm, collection=None, get_document_sources
         formatted_answers += (f"\nAnswer {i}:\n"f"{ans['answer']}\n")
 
     user_message = HumanMessage(content=f"""Original user question: {state["originalQuery"]}\nRetrieved answers:{formatted_answers}""")
-    synthesis_response = llm.invoke([SystemMessage(content=get_aggregation_prompt())] + [user_message])
+    synthesis_response = await llm.ainvoke([SystemMessage(content=get_aggregation_prompt())] + [user_message])
 
     content = synthesis_response.content
     # Strip Sources section if it contains no real file names (e.g., "Answer 1")
@@ -160,19 +154,18 @@ def aggregate_responses(state: State, llm, collection=None, get_document_sources
         "could not find any information",
         "no answers were generated",
     ]
-    if any(phrase in content.lower() for phrase in no_answer_phrases):
-        document_sources = get_document_sources() if get_document_sources else None
-        snippets = _sample_document_snippets(collection, document_sources)
-        if snippets:
-            suggestion_response = llm.invoke([
-                SystemMessage(content=get_suggestion_prompt()),
-                HumanMessage(content=snippets)
-            ])
-            content += f"\n\nHere are some questions you could try:\n{suggestion_response.content}"
+    found_answer = not any(phrase in content.lower() for phrase in no_answer_phrases)
+    if found_answer and answer_cache is not None:
+        await asyncio.to_thread(answer_cache.store, state["rewrittenQuestions"], content, state["corpusVersion"])
+
+    # Suggestions are generated per document at ingestion time and kept in the catalog
+    suggestions = catalog.suggestions_text() if catalog is not None and not found_answer else None
+    if suggestions:
+        content += f"\n\nHere are some questions you could try:\n{suggestions}"
 
     return {"messages": [AIMessage(content=content)]}
 
-def conversational_response(state: State, llm, collection=None, get_document_sources=None):
+async def conversational_response(state: State, llm, catalog=None):
     conversation_summary = state.get("conversation_summary", "")
     original_query = state.get("originalQuery", "")
 
@@ -181,11 +174,10 @@ def conversational_response(state: State, llm, collection=None, get_document_sou
         context = f"Conversation so far:\n{conversation_summary}\n\n"
     context += f"User message:\n{original_query}"
 
-    document_sources = get_document_sources() if get_document_sources else None
-
-    document_snippets = _sample_document_snippets(collection, document_sources)
+    document_sources = catalog.sources() if catalog is not None else None
+    document_snippets = catalog.snippets_text() if catalog is not None else None
 
-    response = llm.invoke([
+    response = await llm.ainvoke([
         SystemMessage(content=get_conversational_prompt(document_sources, document_snippets)),
         HumanMessage(content=context)
     ])
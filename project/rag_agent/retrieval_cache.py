@@ -0,0 +1,91 @@
+from typing import List, Optional
+from langchain_core.documents import Document
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client.http import models as qmodels
+import config
+from cache import LRUCache
+
+class RetrievalCache:
+    """Process-wide cache of query embeddings and ranked hybrid search hits.
+
+    Hits are looked up by the normalized query (case and whitespace), so the
+    same question asked by parallel sub-question agents or repeated within a
+    conversation is searched once; the query itself is embedded as given, so a
+    miss returns exactly what an uncached search would. Hits are keyed by
+    ``corpus_version`` as well, which ``bump_version`` increments whenever the
+    indexed documents change; entries of older versions are never served and
+    age out of the LRU. Query embeddings do not depend on the corpus and are
+    kept across versions.
+    """
+
+    def __init__(self, max_entries=config.RETRIEVAL_CACHE_MAX_ENTRIES, log_interval=config.RETRIEVAL_CACHE_LOG_INTERVAL):
+        self.corpus_version = 0
+        self.log_interval = log_interval
+        self.__embeddings = LRUCache(max_entries=max_entries)
+        self.__results = LRUCache(max_entries=max_entries)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.split()).casefold()
+
+    def bump_version(self) -> None:
+        self.corpus_version += 1
+
+    def search(self, collection: QdrantVectorStore, query: str, k: int, score_threshold: float,
+               search_params: Optional[qmodels.SearchParams] = None) -> List[Document]:
+        """Equivalent of ``collection.similarity_search`` in hybrid mode, served from the cache when possible."""
+        normalized = self.normalize(query)
+        key = (self.corpus_version, normalized, k, score_threshold)
+        results = self.__results.get(key)
+        if results is None:
+            dense, sparse = self.__embed(collection, query)
+            results = self.__hybrid_query(collection, dense, sparse, k, score_threshold, search_params)
+            self.__results.put(key, results)
+        self.__maybe_log()
+        return results
+
+    def __embed(self, collection: QdrantVectorStore, query: str):
+        embeddings = self.__embeddings.get(query)
+        if embeddings is None:
+            embeddings = (collection.embeddings.embed_query(query), collection.sparse_embeddings.embed_query(query))
+            self.__embeddings.put(query, embeddings)
+        return embeddings
+
+    @staticmethod
+    def __hybrid_query(collection: QdrantVectorStore, dense, sparse, k: int, score_threshold: float, search_params) -> List[Document]:
+        # Same prefetch + RRF fusion query QdrantVectorStore runs in HYBRID mode
+        points = collection.client.query_points(
+            collection_name=collection.collection_name,
+            prefetch=[
+                qmodels.Prefetch(using=collection.vector_name, query=dense, limit=k, params=search_params),
+                qmodels.Prefetch(
+                    using=collection.sparse_vector_name,
+                    query=qmodels.SparseVector(indices=sparse.indices, values=sparse.values),
+                    limit=k,
+                    params=search_params,
+                ),
+            ],
+            query=qmodels.FusionQuery(fusion=qmodels.Fusion.RRF),
+            with_payload=True,
+            limit=k,
+            score_threshold=score_threshold,
+        ).points
+        return [
+            Document(
+                page_content=point.payload.get(collection.content_payload_key, ""),
+                metadata={**(point.payload.get(collection.metadata_payload_key) or {}), "_id": point.id, "_collection_name": collection.collection_name},
+            )
+            for point in points
+        ]
+
+    def __maybe_log(self) -> None:
+        stats = self.__results.stats()
+        lookups = stats["hits"] + stats["misses"]
+        if self.log_interval and lookups % self.log_interval == 0:
+            embedding_stats = self.__embeddings.stats()
+            print(f"✓ Retrieval cache: {stats['hit_rate']:.0%} of {lookups} searches served from cache, "
+                  f"query embedding hit rate {embedding_stats['hit_rate']:.0%}, "
+                  f"{stats['entries']} cached result sets (corpus version {self.corpus_version})")
+
+    def stats(self) -> dict:
+        return {"results": self.__results.stats(), "embeddings": self.__embeddings.stats(), "corpus_version": self.corpus_version}
@@ -1,12 +1,22 @@
+import asyncio
 from typing import List
-from langchain_core.tools import tool
+import config
+from langchain_core.tools import StructuredTool
 from db.parent_store_manager import ParentStoreManager
 
 class ToolFactory:
     
-    def __init__(self, collection):
+    def __init__(self, collection, parent_store_manager=None, retrieval_cache=None, search_params=None):
         self.collection = collection
-        self.parent_store_manager = ParentStoreManager()
+        # Share the system's store so its cache sees the invalidations done during ingestion
+        self.parent_store_manager = parent_store_manager or ParentStoreManager()
+        self.retrieval_cache = retrieval_cache
+        self.search_params = search_params
+
+    def _similarity_search(self, query: str, limit: int, score_threshold: float = 0.7):
+        if self.retrieval_cache is None:
+            return self.collection.similarity_search(query, k=limit, score_threshold=score_threshold, search_params=self.search_params)
+        return self.retrieval_cache.search(self.collection, query, limit, score_threshold, self.search_params)
     
     def _search_child_chunks(self, query: str, limit: int) -> str:
         """Search for the top K most relevant child chunks.
@@ -16,7 +26,7 @@ class ToolFactory:
             limit: Maximum number of results to return
         """
         try:
-            results = self.collection.similarity_search(query, k=limit, score_threshold=0.7)
+            results = self._similarity_search(query, limit)
             if not results:
                 return "NO_RELEVANT_CHUNKS"
 
@@ -72,9 +82,47 @@ class ToolFactory:
         except Exception as e:
             return f"PARENT_RETRIEVAL_ERROR: {str(e)}"
     
+    def _search_with_parent_context(self, query: str, limit: int) -> str:
+        """Search for the top K most relevant excerpts and return them together with their full parent sections.
+        
+        Args:
+            query: Search query string
+            limit: Maximum number of excerpts to match
+        """
+        try:
+            results = self._similarity_search(query, limit)
+            if not results:
+                return "NO_RELEVANT_CHUNKS"
+
+            # Parents in the rank order of their best matching child, each fetched once
+            ranked_ids = list(dict.fromkeys(doc.metadata.get("parent_id", "") for doc in results))
+            parents = {p["parent_id"]: p for p in self.parent_store_manager.load_content_many(ranked_ids)}
+            matches = {pid: sum(doc.metadata.get("parent_id") == pid for doc in results) for pid in ranked_ids}
+
+            return "\n\n".join([
+                f"Parent ID: {pid}\n"
+                f"File Name: {parents[pid].get('metadata', {}).get('source', 'unknown')}\n"
+                f"Matching Excerpts: {matches[pid]}\n"
+                f"Content: {parents[pid].get('content', '').strip()}"
+                for pid in ranked_ids if pid in parents
+            ]) or "NO_RELEVANT_CHUNKS"
+
+        except Exception as e:
+            return f"RETRIEVAL_ERROR: {str(e)}"
+    
+    @staticmethod
+    def _as_tool(name: str, func) -> StructuredTool:
+        """Wrap a blocking tool implementation so async graph runs execute it off the event loop."""
+        async def coroutine(**kwargs):
+            return await asyncio.to_thread(func, **kwargs)
+        return StructuredTool.from_function(func=func, coroutine=coroutine, name=name)
+    
     def create_tools(self) -> List:
         """Create and return the list of tools."""
-        search_tool = tool("search_child_chunks")(self._search_child_chunks)
-        retrieve_tool = tool("retrieve_parent_chunks")(self._retrieve_parent_chunks)
+        if config.RETRIEVAL_MODE == "one_hop":
+            return [self._as_tool("search_with_parent_context", self._search_with_parent_context)]
+
+        search_tool = self._as_tool("search_child_chunks", self._search_child_chunks)
+        retrieve_tool = self._as_tool("retrieve_parent_chunks", self._retrieve_parent_chunks)
         
         return [search_tool, retrieve_tool]
\ No newline at end of file
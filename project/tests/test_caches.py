@@ -0,0 +1,85 @@
+"""Invalidation of the retrieval and answer caches when the corpus version is bumped."""
+from types import SimpleNamespace
+from langchain_qdrant.sparse_embeddings import SparseVector
+from rag_agent.answer_cache import SemanticAnswerCache
+from rag_agent.retrieval_cache import RetrievalCache
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.queries = []
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [1.0, float(len(text))]
+
+
+class FakeSparseEmbeddings:
+    def embed_query(self, text):
+        return SparseVector(indices=[0], values=[1.0])
+
+
+class FakeClient:
+    def __init__(self):
+        self.searches = 0
+        self.contents = ["first corpus"]
+
+    def query_points(self, **kwargs):
+        self.searches += 1
+        points = [SimpleNamespace(id=i, payload={"page_content": text, "metadata": {}}) for i, text in enumerate(self.contents)]
+        return SimpleNamespace(points=points)
+
+
+def fake_collection():
+    return SimpleNamespace(
+        client=FakeClient(),
+        embeddings=FakeEmbeddings(),
+        sparse_embeddings=FakeSparseEmbeddings(),
+        collection_name="test",
+        vector_name="dense",
+        sparse_vector_name="sparse",
+        content_payload_key="page_content",
+        metadata_payload_key="metadata",
+    )
+
+
+def test_retrieval_cache_serves_repeats_until_bumped():
+    cache = RetrievalCache(log_interval=0)
+    collection = fake_collection()
+
+    first = cache.search(collection, "What is RAG?", 5, 0.1)
+    assert cache.search(collection, "  what is  rag? ", 5, 0.1) == first
+    assert collection.client.searches == 1
+
+    collection.client.contents = ["second corpus"]
+    cache.bump_version()
+    assert cache.search(collection, "What is RAG?", 5, 0.1)[0].page_content == "second corpus"
+    assert collection.client.searches == 2
+
+
+def test_retrieval_cache_embeds_the_query_as_written():
+    cache = RetrievalCache(log_interval=0)
+    collection = fake_collection()
+    cache.search(collection, "What is  RAG?", 5, 0.1)
+    assert collection.embeddings.queries == ["What is  RAG?"]
+
+
+def make_answer_cache():
+    return SemanticAnswerCache(lambda text: [1.0, float(len(text))], threshold=0.99)
+
+
+def test_answer_cache_is_emptied_by_a_bump():
+    cache = make_answer_cache()
+    cache.store(["what is rag"], "An answer", cache.corpus_version)
+    assert cache.lookup(["what is rag"]) == "An answer"
+
+    cache.bump_version()
+    assert cache.lookup(["what is rag"]) is None
+
+
+def test_answer_from_a_turn_that_straddled_a_bump_is_not_stored():
+    cache = make_answer_cache()
+    turn_version = cache.corpus_version
+    cache.bump_version()
+    cache.store(["what is rag"], "Answer from the old corpus", turn_version)
+    assert cache.lookup(["what is rag"]) is None
@@ -0,0 +1,152 @@
+"""Failure and cancellation behaviour of the threaded ingestion pipeline.
+
+The vector store and parent store are in-process fakes; chunking is real.
+"""
+import threading
+from types import SimpleNamespace
+import pytest
+import config
+from core.ingestion_pipeline import IngestionPipeline
+from db.index_manifest import IndexManifest
+from document_chunker import DocumentChuncker
+
+RUN_TIMEOUT_SECONDS = 30
+
+
+class FakeVectorDb:
+    def __init__(self):
+        self.points = {}
+
+    def embed_documents(self, texts):
+        return [[1.0, 0.0]] * len(texts), [None] * len(texts)
+
+    def upsert_embedded(self, collection_name, chunks, dense, sparse, ids):
+        self.points.update(zip(ids, chunks))
+
+    def delete_by_source(self, collection_name, source):
+        pass
+
+    def delete_points(self, collection_name, ids):
+        for point_id in ids:
+            self.points.pop(point_id, None)
+
+
+class FakeParentStore:
+    def __init__(self):
+        self.parents = {}
+
+    def save_many(self, pairs):
+        self.parents.update(pairs)
+
+    def delete_many(self, parent_ids):
+        for parent_id in parent_ids:
+            self.parents.pop(parent_id, None)
+
+
+class FailingChunker(DocumentChuncker):
+    def iter_file_chunks(self, md_paths, workers=1):
+        for _ in md_paths:
+            raise RuntimeError("chunker crashed")
+        yield from ()
+
+
+@pytest.fixture
+def rag_system(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "MARKDOWN_DIR", str(tmp_path / "markdown"))
+    (tmp_path / "markdown").mkdir()
+    return SimpleNamespace(
+        index_manifest=IndexManifest(str(tmp_path / "manifest.db")),
+        chunker=DocumentChuncker(),
+        vector_db=FakeVectorDb(),
+        parent_store=FakeParentStore(),
+        collection_name="test",
+    )
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"doc{i}.md"
+        path.write_text(f"# Document {i}\n\n" + f"sentence {i} " * 300, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def make_pipeline(rag_system):
+    return IngestionPipeline(rag_system, batch_size=3, queue_size=2, conversion_workers=1, chunking_workers=1)
+
+
+def run_with_timeout(target):
+    """Run ``target`` on a thread and fail the test if it does not return."""
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = target()
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(RUN_TIMEOUT_SECONDS)
+    assert not thread.is_alive(), "ingestion run did not finish"
+    return outcome
+
+
+def test_indexes_every_document(rag_system, documents):
+    pipeline = make_pipeline(rag_system)
+    assert run_with_timeout(lambda: pipeline.run(documents))["result"] == (20, 0)
+    assert rag_system.index_manifest.documents() == sorted(path.stem for path in documents)
+    assert rag_system.vector_db.points and rag_system.parent_store.parents
+
+
+def test_failing_stage_does_not_hang(rag_system, documents):
+    rag_system.chunker = FailingChunker()
+    pipeline = make_pipeline(rag_system)
+    assert run_with_timeout(lambda: pipeline.run(documents))["result"] == (0, 20)
+    assert pipeline.cancelled.is_set()
+
+
+def test_failing_callback_stops_the_run(rag_system, documents):
+    def progress_callback(progress, message):
+        raise ValueError("progress display closed")
+
+    pipeline = make_pipeline(rag_system)
+    outcome = run_with_timeout(lambda: pipeline.run(documents, progress_callback))
+    assert isinstance(outcome.get("error"), ValueError)
+    assert pipeline.cancelled.is_set()
+
+
+def test_failing_delete_by_source_fails_only_its_document(rag_system, documents):
+    def delete_by_source(collection_name, source):
+        if source == "doc3.pdf":
+            raise RuntimeError("qdrant unavailable")
+
+    rag_system.vector_db.delete_by_source = delete_by_source
+    pipeline = make_pipeline(rag_system)
+    assert run_with_timeout(lambda: pipeline.run(documents))["result"] == (19, 1)
+    assert pipeline.failed == {"doc3"}
+    assert "doc3" not in rag_system.index_manifest.documents()
+
+
+def test_cancel_keeps_finished_documents(rag_system, documents):
+    pipeline = make_pipeline(rag_system)
+
+    def progress_callback(progress, message):
+        pipeline.cancel()
+
+    added, failed = run_with_timeout(lambda: pipeline.run(documents, progress_callback))["result"]
+    assert 1 <= added < 20 and added + failed == 20
+    assert len(rag_system.index_manifest.documents()) == added
+
+
+def test_reindexing_markdown_in_place_keeps_source_hash(rag_system, documents):
+    pipeline = make_pipeline(rag_system)
+    run_with_timeout(lambda: pipeline.run(documents[:1]))
+    rag_system.index_manifest.record("doc0", "hash-of-original-pdf", "stale", {}, [])
+
+    md_path = pipeline.markdown_dir / "doc0.md"
+    md_path.write_text("# Edited\n\n" + "edited text " * 300, encoding="utf-8")
+    assert run_with_timeout(lambda: pipeline.run([md_path]))["result"] == (1, 0)
+    assert rag_system.index_manifest.get_document("doc0")["source_hash"] == "hash-of-original-pdf"
@@ -0,0 +1,69 @@
+"""Batch approval and the duplicate-phone rule of EntryReview."""
+import pytest
+from lucky_draw.database import LuckyDrawDB
+from lucky_draw.models import EntryStatus
+from lucky_draw.review import EntryReview
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = LuckyDrawDB(str(tmp_path / "lucky_draw.db"))
+    yield db
+    db.close()
+
+
+def add_entry(db, phone_number, status=EntryStatus.PENDING, confidence=0.9):
+    receipt_no = db.allocate_receipt_no()
+    return db.insert_entry(receipt_no, "Name", phone_number, "name@example.com", 100.0, confidence, status)
+
+
+def statuses(db):
+    with db._get_conn() as conn:
+        return dict(conn.execute("SELECT id, status FROM lucky_draw_entries").fetchall())
+
+
+def test_approve_by_id_only_touches_pending_entries(db):
+    pending = add_entry(db, "0811111111")
+    rejected = add_entry(db, "0822222222", EntryStatus.REJECTED)
+    review = EntryReview(db)
+
+    assert review.approve([pending, rejected]) == {"approved": 1, "applied": 0}
+    assert statuses(db) == {pending: "approved", rejected: "rejected"}
+
+
+def test_approve_by_filter(db):
+    confident = add_entry(db, "0811111111", confidence=0.95)
+    unsure = add_entry(db, "0822222222", confidence=0.4)
+    review = EntryReview(db)
+
+    assert review.approve(min_confidence=0.9)["approved"] == 1
+    assert statuses(db) == {confident: "approved", unsure: "pending"}
+
+
+def test_earliest_approval_of_a_phone_number_is_kept(db):
+    first = add_entry(db, "0811111111", EntryStatus.APPROVED)
+    second = add_entry(db, "0811111111")
+    review = EntryReview(db)
+
+    assert review.approve([second]) == {"approved": 1, "applied": 1}
+    assert statuses(db) == {first: "approved", second: "applied"}
+
+
+def test_duplicates_within_one_batch_keep_one_approval(db):
+    entries = [add_entry(db, "0811111111") for _ in range(3)]
+    other = add_entry(db, "0822222222")
+    review = EntryReview(db)
+
+    assert review.approve(entries + [other]) == {"approved": 4, "applied": 2}
+    result = statuses(db)
+    assert result[entries[0]] == "approved" and result[other] == "approved"
+    assert [result[i] for i in entries[1:]] == ["applied", "applied"]
+
+
+def test_dedupe_demotes_pending_entries_of_approved_phones(db):
+    approved = add_entry(db, "0811111111", EntryStatus.APPROVED)
+    pending = add_entry(db, "0811111111")
+    review = EntryReview(db)
+
+    assert review.apply_duplicate_rule() == 1
+    assert statuses(db) == {approved: "approved", pending: "applied"}
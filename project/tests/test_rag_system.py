@@ -0,0 +1,77 @@
+"""Smoke tests for building the RAG system with the default configuration.
+
+Run from the project directory: python -m pytest tests
+The embedding models are replaced with small fakes so no model is downloaded.
+"""
+import asyncio
+import pytest
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant import SparseEmbeddings
+from langchain_qdrant.sparse_embeddings import SparseVector
+import config
+from db import vector_db_manager
+from core import rag_system as rag_system_module
+from core.rag_system import RAGSystem
+from rag_agent.graph import create_agent_graph
+
+
+class FakeDenseEmbeddings(Embeddings):
+    def __init__(self, model_name=None):
+        pass
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [1.0, float(len(text) % 7), 0.5, 0.25]
+
+
+class FakeSparseEmbeddings(SparseEmbeddings):
+    def __init__(self, model_name=None):
+        pass
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return SparseVector(indices=[len(text) % 11], values=[1.0])
+
+
+@pytest.fixture
+def rag_system(tmp_path, monkeypatch):
+    # Every store path in config is relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(vector_db_manager, "HuggingFaceEmbeddings", FakeDenseEmbeddings)
+    monkeypatch.setattr(vector_db_manager, "FastEmbedSparse", FakeSparseEmbeddings)
+    monkeypatch.setattr(config, "CHECKPOINT_COMPACTION_INTERVAL_SECONDS", 0)
+    return RAGSystem()
+
+
+def test_builds_outside_event_loop(rag_system):
+    assert rag_system.checkpoints.backend == config.CHECKPOINT_BACKEND == "sqlite"
+    assert rag_system.agent_graph is None
+
+
+def test_checkpoints_work_inside_event_loop(rag_system):
+    rag_system.initialize()
+    run_config = rag_system.get_config("smoke-thread")
+
+    async def read_state():
+        return await rag_system.agent_graph.aget_state(run_config)
+
+    state = asyncio.run(read_state())
+    assert state.values == {}
+
+
+def test_switching_retrieval_mode_recompiles_graph(rag_system, monkeypatch):
+    built = []
+
+    def record_tools(llm, tools, *args, **kwargs):
+        built.append([tool.name for tool in tools])
+        return create_agent_graph(llm, tools, *args, **kwargs)
+
+    monkeypatch.setattr(rag_system_module, "create_agent_graph", record_tools)
+    rag_system.initialize()
+    monkeypatch.setattr(config, "RETRIEVAL_MODE", "one_hop")
+    rag_system.build_agent_graph()
+    assert built == [["search_child_chunks", "retrieve_parent_chunks"], ["search_with_parent_context"]]
@@ -0,0 +1,80 @@
+"""Session expiry and eviction in SessionRegistry."""
+import asyncio
+import config
+from core.session_registry import SessionRegistry
+
+
+class FakeStore:
+    def __init__(self, backend):
+        self.backend = backend
+        self.saved = {}
+        self.deleted = []
+
+    def load_session(self, session_id):
+        return None
+
+    def save_session(self, session_id, thread_id):
+        self.saved[session_id] = thread_id
+
+    def delete_session(self, session_id):
+        self.deleted.append(session_id)
+
+
+def make_registry(store=None, **kwargs):
+    evicted = []
+    kwargs.setdefault("memory_limit_mb", None)
+    return SessionRegistry(on_evict=evicted.append, store=store, **kwargs), evicted
+
+
+def hold_lock(session):
+    asyncio.run(session.lock.acquire())
+
+
+def test_least_recently_used_session_is_evicted():
+    registry, evicted = make_registry(max_sessions=2)
+    first = registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+    assert len(registry) == 2
+    assert registry.get("a").thread_id == first.thread_id
+    assert len(evicted) == 1
+
+
+def test_expired_session_gets_a_new_thread():
+    registry, evicted = make_registry(ttl_seconds=10)
+    old = registry.get("a")
+    old.last_seen -= 60
+    registry.get("b")
+    assert evicted == [old.thread_id]
+    assert registry.get("a").thread_id != old.thread_id
+
+
+def test_session_with_a_turn_in_flight_is_not_evicted():
+    registry, evicted = make_registry(max_sessions=1)
+    busy = registry.get("a")
+    hold_lock(busy)
+    registry.get("b")
+    assert busy.thread_id not in evicted
+    assert registry.get("a") is busy
+
+
+def test_memory_pressure_evicts_only_with_the_memory_checkpointer():
+    sqlite_store = FakeStore("sqlite")
+    registry, evicted = make_registry(store=sqlite_store, memory_limit_mb=1)
+    for i in range(20):
+        registry.get(f"s{i}")
+    assert len(registry) == 20 and evicted == []
+
+    memory_store = FakeStore("memory")
+    registry, evicted = make_registry(store=memory_store, memory_limit_mb=1)
+    for i in range(20):
+        registry.get(f"s{i}")
+    assert len(registry) < 20 and evicted
+    # Evicting for memory never deletes a persisted session
+    assert memory_store.deleted == []
+
+
+def test_default_memory_limit_is_ignored_with_sqlite_checkpoints():
+    registry, _ = make_registry(store=FakeStore("sqlite"), memory_limit_mb=config.SESSION_MEMORY_LIMIT_MB)
+    assert registry.memory_limit_bytes is None
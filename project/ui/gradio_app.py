@@ -1,13 +1,18 @@
 import gradio as gr
+import config
 from core.chat_interface import ChatInterface
 from core.document_manager import DocumentManager
+from core.ingestion_jobs import IngestionJobQueue, JobStatus
 from core.rag_system import RAGSystem
 
 def create_gradio_ui():
     rag_system = RAGSystem()
     doc_manager = DocumentManager(rag_system)
-    rag_system.initialize(get_document_sources=doc_manager.get_markdown_files)
+    rag_system.initialize()
     chat_interface = ChatInterface(rag_system)
+    ingestion_jobs = IngestionJobQueue(doc_manager, gate=rag_system.interactive_gate)
+    # One LLM call per document, so it runs like an upload instead of delaying startup
+    ingestion_jobs.submit_backfill()
     
     def format_file_list():
         files = doc_manager.get_markdown_files()
@@ -15,34 +20,66 @@ def create_gradio_ui():
             return "📭 No documents available in the knowledge base"
         return "\n".join([f"{f}" for f in files])
     
-    def upload_handler(files, progress=gr.Progress()):
+    def format_job_list():
+        jobs = ingestion_jobs.jobs()[:10]
+        if not jobs:
+            return "No ingestion jobs yet"
+        lines = []
+        for job in jobs:
+            label = f"{len(job.paths)} file(s)" if job.kind == "add" else job.kind
+            progress = f"{job.progress:4.0%}" if job.status == JobStatus.RUNNING else "    "
+            lines.append(f"#{job.id:<4} {job.status.value:9s} {progress} {label:12s} {job.message}")
+        return "\n".join(lines)
+    
+    def cancel_choices(selected=None):
+        choices = [f"#{job.id}" for job in ingestion_jobs.active()]
+        return gr.update(choices=choices, value=selected if selected in choices else None)
+    
+    def upload_handler(files):
         if not files:
-            return None, format_file_list()
-            
-        added, skipped = doc_manager.add_documents(
-            files, 
-            progress_callback=lambda p, desc: progress(p, desc=desc)
-        )
+            return None, format_job_list(), cancel_choices()
         
-        gr.Info(f"✅ Added: {added} | Skipped: {skipped}")
-        return None, format_file_list()
+        job = ingestion_jobs.submit(files)
+        gr.Info(f"📥 Queued job #{job.id} ({len(job.paths)} file(s))")
+        return None, format_job_list(), cancel_choices()
+    
+    def sync_handler():
+        job = ingestion_jobs.submit_sync()
+        gr.Info(f"🔄 Queued sync job #{job.id}")
+        return format_job_list(), cancel_choices()
+    
+    def cancel_handler(selected):
+        if selected and ingestion_jobs.cancel(int(selected.lstrip("#"))):
+            gr.Info(f"⏹️ Cancelling job {selected}")
+        return format_job_list(), cancel_choices()
+    
+    def poll_handler(selected):
+        return format_job_list(), format_file_list(), cancel_choices(selected)
     
     def clear_handler():
+        # Running jobs would keep writing to the index being cleared
+        if not ingestion_jobs.cancel_all(wait_seconds=60):
+            gr.Warning("⚠️ An ingestion job is still stopping, nothing was removed. Try again once it shows as cancelled.")
+            return format_file_list()
         doc_manager.clear_all()
         gr.Info(f"🗑️ Removed all documents")
         return format_file_list()
     
-    def chat_handler(msg, hist):
-        return chat_interface.chat(msg, hist)
+    async def chat_handler(msg, hist, request: gr.Request):
+        async for reply in chat_interface.chat(msg, hist, request.session_hash):
+            yield reply
     
-    def clear_chat_handler():
-        chat_interface.clear_session()
+    def clear_chat_handler(request: gr.Request):
+        chat_interface.clear_session(request.session_hash)
+    
+    def end_session_handler(request: gr.Request):
+        chat_interface.end_session(request.session_hash)
     
     with gr.Blocks(title="Agentic RAG") as demo:
         
         with gr.Tab("Documents", elem_id="doc-management-tab"):
             gr.Markdown("## Add New Documents")
-            gr.Markdown("Upload PDF or Markdown files. Duplicates will be automatically skipped.")
+            gr.Markdown("Upload PDF or Markdown files. Unchanged files are skipped; updated files are re-indexed incrementally in the background.")
             
             files_input = gr.File(
                 label="Drop PDF or Markdown files here",
@@ -54,6 +91,18 @@ def create_gradio_ui():
             
             add_btn = gr.Button("Add Documents", variant="primary", size="md")
             
+            gr.Markdown("## Ingestion Jobs")
+            job_list = gr.Textbox(
+                value=format_job_list(),
+                interactive=False,
+                lines=5,
+                max_lines=10,
+                show_label=False
+            )
+            with gr.Row():
+                cancel_select = gr.Dropdown(choices=[], label="Job", scale=3)
+                cancel_btn = gr.Button("Cancel Job", size="md", scale=1)
+            
             gr.Markdown("## Current Documents in the Knowledge Base")
             file_list = gr.Textbox(
                 value=format_file_list(),
@@ -66,16 +115,17 @@ def create_gradio_ui():
             
             with gr.Row():
                 refresh_btn = gr.Button("Refresh", size="md")
+                sync_btn = gr.Button("Sync", size="md")
                 clear_btn = gr.Button("Clear All", variant="stop", size="md")
             
-            add_btn.click(
-                upload_handler, 
-                [files_input], 
-                [files_input, file_list], 
-                show_progress="corner"
-            )
+            add_btn.click(upload_handler, [files_input], [files_input, job_list, cancel_select])
             refresh_btn.click(format_file_list, None, file_list)
+            sync_btn.click(sync_handler, None, [job_list, cancel_select])
+            cancel_btn.click(cancel_handler, [cancel_select], [job_list, cancel_select])
             clear_btn.click(clear_handler, None, file_list)
+            
+            job_timer = gr.Timer(config.INGESTION_JOB_POLL_SECONDS)
+            job_timer.tick(poll_handler, [cancel_select], [job_list, file_list, cancel_select], show_progress="hidden")
         
         with gr.Tab("Chat"):
             chatbot = gr.Chatbot(
@@ -86,5 +136,7 @@ def create_gradio_ui():
             chatbot.clear(clear_chat_handler)
             
             gr.ChatInterface(fn=chat_handler, chatbot=chatbot)
+        
+        demo.unload(end_session_handler)
     
     return demo
\ No newline at end of file
@@ -2,6 +2,9 @@ import os
 import config
 import pymupdf.layout
 import pymupdf4llm
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 import glob
 
@@ -21,4 +24,68 @@ def pdfs_to_markdowns(path_pattern, overwrite: bool = False):
     for pdf_path in map(Path, glob.glob(path_pattern)):
         md_path = (output_dir / pdf_path.stem).with_suffix(".md")
         if overwrite or not md_path.exists():
-            pdf_to_markdown(pdf_path, output_dir)
\ No newline at end of file
+            pdf_to_markdown(pdf_path, output_dir)
+
+def _convert_in_pool(pdf_paths, output_dir, max_workers):
+    """Convert PDFs in a process pool, yielding (pdf_path, error) as files finish.
+
+    At most ``max_workers * 2`` conversions are in flight at once. If a worker dies
+    (e.g. pymupdf segfaults on a corrupt file) the unfinished paths are yielded with
+    a BrokenProcessPool error so the caller can retry them in isolation.
+    """
+    pending_paths = iter(pdf_paths)
+    in_flight = {}
+    # spawn avoids forking a parent that already holds torch / onnx thread pools
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        def submit_next():
+            pdf_path = next(pending_paths, None)
+            if pdf_path is not None:
+                in_flight[executor.submit(pdf_to_markdown, str(pdf_path), str(output_dir))] = pdf_path
+
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                pdf_path = in_flight.pop(future)
+                error = future.exception()
+                if isinstance(error, BrokenProcessPool):
+                    yield pdf_path, error
+                    for other in in_flight.values():
+                        yield other, error
+                    for other in pending_paths:
+                        yield other, error
+                    return
+                yield pdf_path, error
+                submit_next()
+
+def convert_pdfs_parallel(pdf_paths, output_dir=config.MARKDOWN_DIR, max_workers=config.PDF_CONVERSION_WORKERS):
+    """Convert PDFs on several cores, yielding (pdf_path, error) in completion order.
+
+    ``error`` is None on success. A failing file never stops the rest of the batch:
+    exceptions are reported per file, and files caught in a crashed worker pool are
+    retried one at a time in a fresh single-worker pool.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pdf_paths = [Path(p) for p in pdf_paths]
+
+    if max_workers <= 1:
+        for pdf_path in pdf_paths:
+            try:
+                pdf_to_markdown(pdf_path, output_dir)
+                yield pdf_path, None
+            except Exception as e:
+                yield pdf_path, e
+        return
+
+    crashed = []
+    for pdf_path, error in _convert_in_pool(pdf_paths, output_dir, max_workers):
+        if isinstance(error, BrokenProcessPool):
+            crashed.append(pdf_path)
+        else:
+            yield pdf_path, error
+
+    for pdf_path in crashed:
+        yield from _convert_in_pool([pdf_path], output_dir, 1)